@@ -3,11 +3,11 @@ import os
 import sys
 
 from argparse import ArgumentParser
+from copy import deepcopy
+from typing import Optional, Sequence
 
-from .generators import (
-    get_code_generator_factory_for_language,
-    is_valid_language,
-)
+from .generators import get_code_generator_factory_for_language
+from .parsing import parse_specification_file
 from .providers.docstrings import FolderBasedDocstringProvider
 from .version import __version__
 
@@ -75,15 +75,15 @@ def create_argument_parser() -> ArgumentParser:
     return parser
 
 
-def main():
+def main(argv: Optional[Sequence[str]] = None) -> None:
     logging.basicConfig(
         format="%(levelname)-10s| %(message)s", level=logging.INFO, stream=sys.stderr
     )
 
     parser = create_argument_parser()
-    options = parser.parse_args()
+    options = parser.parse_args(argv)
 
-    type_files = options.types or ()
+    type_files = options.types
     function_files = options.functions
     inputs = options.input
     languages = options.language
@@ -100,39 +100,60 @@ def main():
         else:
             parser.error("Number of languages and output files must match")
 
+    factories = []
     for language in languages:
-        if not is_valid_language(language):
+        try:
+            factories.append(get_code_generator_factory_for_language(language))
+        except KeyError:
             parser.error(f"Unknown language: {language}")
 
-    for path in type_files:
-        if not os.access(path, os.R_OK):
-            parser.error(f"Cannot open type file: {path}")
-
-    for path in function_files:
-        if not os.access(path, os.R_OK):
-            parser.error(f"Error: cannot open function file: {path}")
-
-    for path in inputs:
-        if not os.access(path, os.R_OK):
-            parser.error(f"Error: cannot open input file: {path}")
+    # Check each file only once, even if it was given multiple times or in
+    # multiple roles
+    checked = set()
+    for kind, paths in (
+        ("type", type_files),
+        ("function", function_files),
+        ("input", inputs),
+    ):
+        for path in paths:
+            if path in checked:
+                continue
+            if not os.access(path, os.R_OK):
+                parser.error(f"Cannot open {kind} file: {path}")
+            checked.add(path)
 
     # Construct a log that the generators can write their messages to
     log = logging.getLogger()
 
+    # Parse the specification files only once, no matter how many languages
+    # we generate code for
+    function_specs = [parse_specification_file(path) for path in function_files]
+    type_specs = [parse_specification_file(path) for path in type_files]
+
+    # Docstrings are rendered once and shared between the generators
+    docstring_provider = (
+        FolderBasedDocstringProvider(docstring_dir) if docstring_dir else None
+    )
+
     # OK, do the trick:
-    for language, output in zip(languages, outputs):
-        factory = get_code_generator_factory_for_language(language)
+    for index, (factory, output) in enumerate(zip(factories, outputs)):
+        # Loading the specifications into a generator may modify the nested
+        # objects in them, so each generator except the last one needs its
+        # own copy
+        needs_copy = index < len(factories) - 1
 
         generator = factory()
         generator.use_logger(log)
-        for path in function_files:
-            generator.load_function_descriptors_from_file(path)
-        for path in type_files:
-            generator.load_type_descriptors_from_file(path)
-        if docstring_dir:
-            generator.use_docstring_provider(
-                FolderBasedDocstringProvider(docstring_dir)
+        for spec in function_specs:
+            generator.load_function_descriptors_from_object(
+                deepcopy(spec) if needs_copy else spec
+            )
+        for spec in type_specs:
+            generator.load_type_descriptors_from_object(
+                deepcopy(spec) if needs_copy else spec
             )
+        if docstring_provider:
+            generator.use_docstring_provider(docstring_provider)
 
         if output == "-":
             generator.generate(inputs, sys.stdout)
@@ -1,24 +1,25 @@
 import re
+import sys
 
 from abc import abstractmethod, ABCMeta
-from collections import Counter, OrderedDict
 from enum import Enum
 from io import StringIO
 from logging import Logger
 from pathlib import Path
-from shutil import copyfileobj
 from typing import (
     Any,
     Dict,
     IO,
     Iterable,
     List,
+    Optional,
     Sequence,
-    Tuple,
+    Set,
 )
 
 from stimulus.errors import CodeGenerationError, NoSuchTypeError
 from stimulus.model import DocstringProvider, FunctionDescriptor, TypeDescriptor
+from stimulus.parsing import parse_specification_file
 from stimulus.utils import constant
 
 __all__ = (
@@ -33,6 +34,8 @@ __all__ = (
 class CodeGenerator(metaclass=ABCMeta):
     """Interface specification for code generators."""
 
+    __slots__ = ()
+
     name: str
 
     @abstractmethod
@@ -107,6 +110,8 @@ def _nop(*args, **kwds) -> None:
 
 
 class _DummyLogger:
+    debug = info = warning = error = critical = exception = staticmethod(_nop)
+
     def __getattr__(self, name: str):
         return _nop
 
@@ -114,6 +119,15 @@ class _DummyLogger:
 class CodeGeneratorBase(CodeGenerator):
     """Base class for code generator implementations."""
 
+    __slots__ = (
+        "log",
+        "_docstring_provider",
+        "_function_descriptors",
+        "_type_descriptors",
+        "_active_functions",
+        "_ignored_functions",
+    )
+
     log: Logger
     name: str
 
@@ -121,26 +135,32 @@ class CodeGeneratorBase(CodeGenerator):
     _function_descriptors: Dict[str, FunctionDescriptor]
     _type_descriptors: Dict[str, TypeDescriptor]
 
-    _deps_cache: Dict[str, Dict[str, Tuple[str, ...]]]
-    _ignore_cache: Dict[str, bool]
+    _active_functions: Optional[List[str]]
+    _ignored_functions: Optional[Set[str]]
+
+    def __init_subclass__(cls, **kwds):
+        super().__init_subclass__(**kwds)
 
-    def __init__(self):
-        """Constructor."""
         # Set name, note this only works correctly if derived classes always
         # extend it as by prepending the language to the CodeGenerator class
-        # name
-        self.name = type(self).__name__
-        if self.name.endswith("CodeGenerator"):
-            self.name = self.name[0 : len(self.name) - len("CodeGenerator")]
+        # name. The name is computed once per class, not once per instance,
+        # and it is interned because it is looked up in the IGNORE sets of
+        # all the function descriptors
+        name = cls.__name__
+        if name.endswith("CodeGenerator"):
+            name = name[: -len("CodeGenerator")]
+        cls.name = sys.intern(name)
 
+    def __init__(self):
+        """Constructor."""
         self.log = _DummyLogger()  # type: ignore
 
         self._docstring_provider = constant(None)
-        self._function_descriptors = OrderedDict()
+        self._function_descriptors = {}
         self._type_descriptors = {}
 
-        self._deps_cache = {}
-        self._ignore_cache = {}
+        self._active_functions = None
+        self._ignored_functions = None
 
     def check_types_of_function(self, function: str, errors: str = "raise") -> bool:
         """Checks whether the types of all the input arguments of the given
@@ -192,6 +212,11 @@ class CodeGeneratorBase(CodeGenerator):
             if spec is not None:
                 descriptor.update_from(spec)
 
+        # IGNORE declarations may have changed, so the cached decisions are
+        # not valid any more
+        self._active_functions = None
+        self._ignored_functions = None
+
     def load_type_descriptors_from_file(self, filename: str) -> None:
         specs = self._parse_file(filename)
         self.load_type_descriptors_from_object(specs)
@@ -203,7 +228,7 @@ class CodeGeneratorBase(CodeGenerator):
                 descriptor.update_from(spec)
 
     def use_docstring_provider(self, provider: DocstringProvider) -> None:
-        self.docstring_provider = provider
+        self._docstring_provider = provider
 
     def use_logger(self, log: Logger) -> None:
         self.log = log
@@ -212,12 +237,31 @@ class CodeGeneratorBase(CodeGenerator):
         return self._function_descriptors[name]
 
     def get_or_create_function_descriptor(self, name: str) -> FunctionDescriptor:
-        try:
-            descriptor = self.get_function_descriptor(name)
-        except KeyError:
+        descriptor = self._function_descriptors.get(name)
+        if descriptor is None:
             descriptor = self._function_descriptors[name] = FunctionDescriptor(name)
+            self._active_functions = None
+            self._ignored_functions = None
         return descriptor
 
+    def get_parameter_type_descriptors(
+        self, desc: FunctionDescriptor
+    ) -> Dict[str, TypeDescriptor]:
+        """Returns a dictionary mapping the names of the parameters of the
+        given function to the descriptors of their types.
+
+        Code generators that process the parameter list of a function multiple
+        times may use this function to look up the type descriptors only once.
+
+        Raises:
+            NoSuchTypeError: if the type of a parameter is not known to the
+                code generator
+        """
+        return {
+            param.name: self.get_type_descriptor(param.type)
+            for param in desc.iter_parameters()
+        }
+
     def get_type_descriptor(self, name: str) -> TypeDescriptor:
         try:
             return self._type_descriptors[name]
@@ -225,9 +269,11 @@ class CodeGeneratorBase(CodeGenerator):
             raise NoSuchTypeError(name) from None
 
     def get_or_create_type_descriptor(self, name: str) -> TypeDescriptor:
-        try:
-            descriptor = self.get_type_descriptor(name)
-        except NoSuchTypeError:
+        descriptor = self._type_descriptors.get(name)
+        if descriptor is None:
+            # Type names are interned, just like the types of the parameters
+            # that are looked up in this dict
+            name = sys.intern(name)
             descriptor = self._type_descriptors[name] = TypeDescriptor(name)
         return descriptor
 
@@ -251,20 +297,29 @@ class CodeGeneratorBase(CodeGenerator):
     def iter_functions(self, include_ignored: bool = False) -> Iterable[str]:
         """Iterator that yields the names of the functions in the function
         specification that are _not_ to be ignored by this generator.
+
+        The list of functions that are not ignored is computed only once and
+        then reused until new function descriptors are loaded.
         """
         if include_ignored:
-            yield from self._function_descriptors.keys()
-        else:
-            for name in self._function_descriptors:
-                if not self.should_ignore_function(name):
-                    yield name
+            return iter(self._function_descriptors.keys())
+
+        if self._active_functions is None:
+            self._active_functions = [
+                name
+                for name in self._function_descriptors
+                if not self.should_ignore_function(name)
+            ]
+        return iter(self._active_functions)
 
     def should_ignore_function(self, name: str) -> bool:
         """Returns whether the function with the given name should be ignored
         by this code generator.
 
-        This function is memoized. Do not override this function; override
-        `_should_ignore_function()` instead.
+        This function is memoized; the names of all the ignored functions are
+        determined in a single pass when it is called for the first time. Do
+        not override this function; override `_should_ignore_function()`
+        instead.
 
         Parameters:
             name: the name of the function
@@ -272,32 +327,24 @@ class CodeGeneratorBase(CodeGenerator):
         Returns:
             whether the function should be ignored by this code generator
         """
-        result = self._ignore_cache.get(name)
-        if result is None:
-            self._ignore_cache[name] = result = self._should_ignore_function(name)
-        return result
+        ignored = self._ignored_functions
+        if ignored is None:
+            ignored = self._ignored_functions = {
+                name
+                for name in self._function_descriptors
+                if self._should_ignore_function(name)
+            }
+        return name in ignored
 
     def _append_inputs(self, inputs: Sequence[str], output: IO[str]) -> None:
+        # Input files are small; read each of them in one go and write it to
+        # the output with a single call
         for input in inputs:
-            with Path(input).open() as fp:
-                copyfileobj(fp, output)
+            output.write(Path(input).read_text())
 
     def _parse_file(self, name: str) -> Dict[str, Any]:
         """Parses a generic input file from YAML format."""
-        from yaml import safe_load
-
-        # Check for top-level duplicate keys
-        with open(name) as fp:
-            keys = Counter(
-                line.strip().rstrip(":") for line in fp if line and line[0].isalpha()
-            )
-        duplicates = sorted(k for k, v in keys.items() if v > 1)
-        if duplicates:
-            raise ValueError(f"duplicate keys found: {', '.join(duplicates)}")
-
-        # No top-level duplicate keys, load the YAML file
-        with open(name) as fp:
-            return safe_load(fp)
+        return parse_specification_file(name)
 
     def _should_ignore_function(self, name: str) -> bool:
         """Returns whether the function with the given name should be ignored
@@ -326,7 +373,12 @@ class BlockBasedCodeGenerator(CodeGeneratorBase):
     dash only.
     """
 
-    _BLOCK_REGEXP = re.compile(r"^\s*%\s*STIMULUS:?\s*(?P<name>[-A-Za-z0-9_]*)\s*%")
+    __slots__ = ("_block_cache",)
+
+    _BLOCK_REGEXP = re.compile(
+        r"^[^\S\n]*%[^\S\n]*STIMULUS:?[^\S\n]*(?P<name>[-A-Za-z0-9_]*)[^\S\n]*%.*\n?",
+        re.MULTILINE,
+    )
 
     _block_cache: Dict[str, str]
 
@@ -337,9 +389,22 @@ class BlockBasedCodeGenerator(CodeGeneratorBase):
     def generate(self, inputs: Sequence[str], out: IO[str]) -> None:
         for input in inputs:
             with open(input) as fp:
-                for line in fp:
-                    if not self._process_marker_line(line, out):
-                        out.write(line)
+                text = fp.read()
+
+            # Input files without any marker are copied verbatim; this check
+            # is much cheaper than running the regex over the whole file
+            if "STIMULUS" not in text:
+                out.write(text)
+                continue
+
+            # Copy everything between the marker lines verbatim and replace
+            # each marker line with the contents of the corresponding block
+            start = 0
+            for match in self._BLOCK_REGEXP.finditer(text):
+                out.write(text[start : match.start()])
+                out.write(self._get_block(match.group("name") or "functions"))
+                start = match.end()
+            out.write(text[start:])
 
     def _generate_block(self, name: str) -> str:
         """Generates the contents of the block with the given name.
@@ -355,25 +420,14 @@ class BlockBasedCodeGenerator(CodeGeneratorBase):
         handler(buf)
         return buf.getvalue()
 
-    def _process_marker_line(self, line: str, out: IO[str]) -> bool:
-        """Attempts to process a potential marker line in one of the input files.
-
-        Marker lines are the ones that start with ``% STIMULUS``.
-
-        Returns:
-            whether the line was handled. Unhandled files should be forwarded to
-            the output as is by the caller.
+    def _get_block(self, name: str) -> str:
+        """Returns the contents of the block with the given name, generating it
+        if it is not in the cache yet.
         """
-        match = self._BLOCK_REGEXP.match(line)
-        if match:
-            block_name = match.group("name") or "functions"
-            block = self._block_cache.get(block_name)
-            if block is None:
-                self._block_cache[block_name] = block = self._generate_block(block_name)
-            out.write(block)
-            return True
-        else:
-            return False
+        block = self._block_cache.get(name)
+        if block is None:
+            self._block_cache[name] = block = self._generate_block(name)
+        return block
 
 
 class InputPlacement(Enum):
@@ -390,14 +444,20 @@ class SingleBlockCodeGenerator(CodeGeneratorBase):
     puts the content of all input files before or after them.
     """
 
+    __slots__ = ("_input_placement",)
+
     def __init__(self, input_placement: InputPlacement = InputPlacement.PREAMBLE):
         super().__init__()
         self._input_placement = input_placement
 
     def generate(self, inputs: Sequence[str], output: IO[str]) -> None:
-        self.generate_preamble(inputs, output)
-        self.generate_functions_block(output)
-        self.generate_epilogue(inputs, output)
+        # Generators emit lots of small writes; collect them in memory and
+        # write the result to the real output stream in one go
+        buf = StringIO()
+        self.generate_preamble(inputs, buf)
+        self.generate_functions_block(buf)
+        self.generate_epilogue(inputs, buf)
+        output.write(buf.getvalue())
 
     def generate_epilogue(self, inputs: Sequence[str], output: IO[str]) -> None:
         """Processes the input files with the given names and generates the
@@ -9,7 +9,7 @@ Typically, they are used from the command line as follows::
 """
 
 from collections import Counter
-from functools import partial
+from itertools import chain
 from textwrap import dedent
 from typing import IO, List, Sequence
 
@@ -34,14 +34,18 @@ class ListTypesCodeGenerator(SingleBlockCodeGenerator):
 
     def generate_function(self, name: str, output: IO[str]) -> None:
         spec = self.get_function_descriptor(name)
-        self.collected_types.update(param.type for param in spec.iter_parameters())
-        self.collected_types.update((spec.return_type,))
+        self.collected_types.update(
+            chain((param.type for param in spec.iter_parameters()), (spec.return_type,))
+        )
 
     def generate_functions_block(self, output: IO[str]) -> None:
         super().generate_functions_block(output)
-        write = partial(print, file=output)
-        for type, count in sorted(self.collected_types.items()):
-            write(type, count)
+        output.write(
+            "".join(
+                f"{type} {count}\n"
+                for type, count in sorted(self.collected_types.items())
+            )
+        )
 
 
 class FunctionSpecificationValidator(SingleBlockCodeGenerator):
@@ -67,15 +71,11 @@ class FunctionSpecificationValidator(SingleBlockCodeGenerator):
         self.unknown_types = Counter()
 
     def generate_preamble(self, inputs: Sequence[str], output: IO[str]) -> None:
-        write = partial(print, file=output)
-
-        write("#include <igraph.h>\n")
-        write("#include <cstdio>")
-        write("#include <type_traits>\n")
+        output.write(
+            "#include <igraph.h>\n\n#include <cstdio>\n#include <type_traits>\n\n"
+        )
 
     def generate_function(self, name: str, output: IO[str]) -> None:
-        write = partial(print, file=output)
-
         args: List[str] = []
 
         # Determine parameter declarations in C
@@ -119,13 +119,11 @@ class FunctionSpecificationValidator(SingleBlockCodeGenerator):
 
         # Write the function declaration to the output
         args_str = ", ".join(args) or "void"
-        write(f"{return_type} generated_{name}({args_str});")
+        output.write(f"{return_type} generated_{name}({args_str});\n")
 
         self.functions.append(name)
 
     def generate_epilogue(self, inputs: Sequence[str], output: IO[str]) -> None:
-        write = partial(print, file=output)
-
         checks = "\n".join(
             dedent(
                 f"""\
@@ -140,29 +138,29 @@ class FunctionSpecificationValidator(SingleBlockCodeGenerator):
             for name in self.functions
         )
         checks = indent(checks)
-        write()
-        write("int main() {")
 
         # Turn off the GCC warning about deprecated declarations because we
         # also want to check those
-        write()
-        write("#if defined(__GNUC__)")
-        write("#  pragma GCC diagnostic push")
-        write('#  pragma GCC diagnostic ignored "-Wdeprecated-declarations"')
-        write("#endif")
-        write()
-
-        write(checks)
-
-        write()
-        write("#if defined(__GNUC__)")
-        write("#  pragma GCC diagnostic pop")
-        write("#endif")
-
-        write()
-        write('    printf("Everything OK!\\n");')
-        write("    return 0;")
-        write("}")
+        lines = [
+            "",
+            "int main() {",
+            "",
+            "#if defined(__GNUC__)",
+            "#  pragma GCC diagnostic push",
+            '#  pragma GCC diagnostic ignored "-Wdeprecated-declarations"',
+            "#endif",
+            "",
+            checks,
+            "",
+            "#if defined(__GNUC__)",
+            "#  pragma GCC diagnostic pop",
+            "#endif",
+            "",
+            '    printf("Everything OK!\\n");',
+            "    return 0;",
+            "}",
+        ]
+        output.write("\n".join(lines) + "\n")
 
         if self.unknown_types:
             self.log.info("Most common types that were not known to the type system:")
@@ -3,17 +3,46 @@
 TODO: - everything :) This is just a PoC implementation.
 """
 
+from itertools import starmap
 from typing import Any, Dict, IO
 
 from stimulus.errors import StimulusError
-from stimulus.model import ParamMode, ParamSpec
+from stimulus.model import FunctionDescriptor, ParamMode, ParamSpec, TypeDescriptor
 
 from .base import BlockBasedCodeGenerator
-from .utils import create_indentation_function
+from .utils import (
+    create_indentation_function,
+    get_dependency_placeholders,
+    replace_placeholders,
+)
 
 
 indent = create_indentation_function("  ")
 
+#: Template of the JNI glue code generated for a single function by the Java C
+#: code generator
+_JAVA_C_FUNCTION_TEMPLATE = """
+/*-------------------------------------------/
+/ {func:<42} /
+/-------------------------------------------*/
+{header} {{
+                                        /* Declarations */
+{decl}
+
+{before}
+                                        /* Convert input */
+{inconv}
+                                        /* Call igraph */
+{call}
+                                        /* Convert output */
+{outconv}
+
+{after}
+
+  return result;
+}}
+"""
+
 
 class JavaCodeGenerator(BlockBasedCodeGenerator):
     """Class containing the common parts of JavaJavaCodeGenerator and
@@ -131,6 +160,16 @@ class JavaJavaCodeGenerator(JavaCodeGenerator):
 
 
 class JavaCCodeGenerator(JavaCodeGenerator):
+    BEFORE_CHUNK = "  Java_igraph_before();"
+    """Code to insert before the input conversions; we simply call
+    Java_igraph_before
+    """
+
+    AFTER_CHUNK = "  Java_igraph_after();"
+    """Code to insert after the output conversions; we simply call
+    Java_igraph_after
+    """
+
     def generate_function(self, function: str, out: IO[str]) -> None:
         try:
             self.metadata = self.get_function_metadata(function, "CTYPE")
@@ -154,42 +193,19 @@ class JavaCCodeGenerator(JavaCodeGenerator):
             res = {}
             res["func"] = function
             res["header"] = self.chunk_header(function, params)
-            res["decl"] = self.chunk_declaration(function, params)
-            res["before"] = self.chunk_before(function, params)
-            res["inconv"] = self.chunk_inconv(function)
-            res["call"] = self.chunk_call(function, params)
-            res["outconv"] = self.chunk_outconv(function, params)
-            res["after"] = self.chunk_after(function, params)
+            types = self.get_parameter_type_descriptors(desc)
+            res["decl"] = self.chunk_declaration(desc, params, types)
+            res["before"] = self.BEFORE_CHUNK
+            res["inconv"] = self.chunk_inconv(desc, types)
+            res["call"] = self.chunk_call(function, params, types)
+            res["outconv"] = self.chunk_outconv(desc, params, types)
+            res["after"] = self.AFTER_CHUNK
         except StimulusError as e:
             out.write("/* %s */\n" % str(e))
             return
 
         # Replace into the template
-        text = (
-            """
-/*-------------------------------------------/
-/ %(func)-42s /
-/-------------------------------------------*/
-%(header)s {
-                                        /* Declarations */
-%(decl)s
-
-%(before)s
-                                        /* Convert input */
-%(inconv)s
-                                        /* Call igraph */
-%(call)s
-                                        /* Convert output */
-%(outconv)s
-
-%(after)s
-
-  return result;
-}\n"""
-            % res
-        )
-
-        out.write(text)
+        out.write(_JAVA_C_FUNCTION_TEMPLATE.format_map(res))
 
     def chunk_header(self, function: str, params: Dict[str, ParamSpec]) -> str:
         """The header.
@@ -220,7 +236,12 @@ class JavaCCodeGenerator(JavaCodeGenerator):
         res = "JNIEXPORT %(return_type)s JNICALL %(funcname)s(%(types)s)" % data
         return res
 
-    def chunk_declaration(self, function: str, params: Dict[str, ParamSpec]) -> str:
+    def chunk_declaration(
+        self,
+        desc: FunctionDescriptor,
+        params: Dict[str, ParamSpec],
+        types: Dict[str, TypeDescriptor],
+    ) -> str:
         """The declaration part of the function body
 
         There are a couple of things to declare. First a C type is
@@ -233,33 +254,30 @@ class JavaCCodeGenerator(JavaCodeGenerator):
         (e.g. in the case of igraph_linegraph), we need a jclass variable
         to store the Java class object."""
 
-        desc = self.get_function_descriptor(function)
-
         def do_cpar(spec: ParamSpec) -> str:
-            type_desc = self.get_type_descriptor(spec.type)
+            type_desc = types[spec.name]
             return type_desc.declare_c_variable(f"c_{spec.name}", mode=spec.mode)
 
         def do_jpar(spec: ParamSpec) -> str:
-            type_desc = self.get_type_descriptor(spec.type)
+            type_desc = types[spec.name]
             return type_desc.declare_c_variable(
                 f"j_{spec.name}", mode=spec.mode, name_token="%J%"
             )
 
-        inout = [do_cpar(param) for param in desc.iter_parameters()]
-        out = [
-            do_jpar(param)
-            for param in desc.iter_parameters()
-            if param.mode is ParamMode.OUT
-        ]
+        decls = [decl for decl in map(do_cpar, desc.iter_parameters()) if decl]
+        for param in desc.iter_parameters():
+            if param.mode is ParamMode.OUT:
+                decl = do_jpar(param)
+                if decl:
+                    decls.append(decl)
 
         return_type_desc = self.get_type_descriptor(desc.return_type)
         retdecl = return_type_desc.declare_c_variable("c__result")
 
-        rnames = [n for n, p in params.items() if p.is_output]
+        first_output = next((p for p in params.values() if p.is_output), None)
         jretdecl = ""
-        if len(rnames) > 0:
-            n = rnames[0]
-            rtname = params[n].type
+        if first_output is not None:
+            rtname = first_output.type
         else:
             rtname = desc.return_type
 
@@ -269,7 +287,10 @@ class JavaCCodeGenerator(JavaCodeGenerator):
         elif "JAVATYPE" in rt:
             jretdecl = rt["JAVATYPE"] + " result;"
 
-        decls = inout + out + [retdecl, jretdecl]
+        if retdecl:
+            decls.append(retdecl)
+        if jretdecl:
+            decls.append(jretdecl)
         if not self.metadata["is_static"] and rtname == "GRAPH":
             self.metadata["need_class_decl"] = True
             decls.append(
@@ -278,13 +299,11 @@ class JavaCCodeGenerator(JavaCodeGenerator):
             )
         else:
             self.metadata["need_class_decl"] = False
-        return indent("\n".join(i for i in decls if i != ""))
-
-    def chunk_before(self, function: str, params: Dict[str, ParamSpec]) -> str:
-        """We simply call Java_igraph_before"""
-        return "  Java_igraph_before();"
+        return indent("\n".join(decls))
 
-    def chunk_inconv(self, function: str) -> str:
+    def chunk_inconv(
+        self, desc: FunctionDescriptor, types: Dict[str, TypeDescriptor]
+    ) -> str:
         """Input conversions. Not only for types with mode 'IN' and
         'INOUT', eg. for 'OUT' vector types we need to allocate the
         required memory here, do all the initializations, etc. Types
@@ -292,41 +311,40 @@ class JavaCCodeGenerator(JavaCodeGenerator):
         performed at the end.
         """
 
-        desc = self.get_function_descriptor(function)
-
         def do_par(param: ParamSpec):
             cname = "c_" + param.name
-            t = self.get_type_descriptor(param.type)
+            t = types[param.name]
             inconv = t.get_input_conversion_template_for(param.mode)
-            if inconv:
-                inconv = indent(inconv)
-            for i, dep in enumerate(param.dependencies):
-                inconv = inconv.replace("%C" + str(i + 1) + "%", "c_" + dep)
-
-            return inconv.replace("%C%", cname).replace("%I%", param.name)
+            return replace_placeholders(
+                indent(inconv),
+                {
+                    "C": cname,
+                    "I": param.name,
+                    **get_dependency_placeholders(param, "C", "c_"),
+                },
+            )
 
-        inconv = [do_par(param) for param in desc.iter_parameters()]
-        inconv = [i for i in inconv if i != ""]
+        inconv = [i for i in map(do_par, desc.iter_parameters()) if i]
 
         return "\n".join(inconv)
 
-    def chunk_call(self, function, params):
+    def chunk_call(
+        self,
+        function: str,
+        params: Dict[str, ParamSpec],
+        types: Dict[str, TypeDescriptor],
+    ) -> str:
         """Every single argument is included, independently of their
         mode. If a type has a 'CALL' field then that is used after the
         usual %C% and %I% substitutions, otherwise the standard 'c_'
         prefixed C argument name is used.
         """
-        types = [self.get_type_descriptor(params[n].type) for n in params]
-        call = list(
-            map(lambda t, n: t.get("CALL", "c_" + n), types, list(params.keys()))
-        )
-        call = list(
-            map(
-                lambda c, n: c.replace("%C%", "c_" + n).replace("%I%", n),
-                call,
-                list(params.keys()),
+        call = [
+            replace_placeholders(
+                types[name].get("CALL", "c_" + name), {"C": "c_" + name, "I": name}
             )
-        )
+            for name in params
+        ]
         lines = [
             "  if ((*env)->ExceptionCheck(env)) {",
             "    c__result = IGRAPH_EINVAL;",
@@ -336,7 +354,12 @@ class JavaCCodeGenerator(JavaCodeGenerator):
         ]
         return "\n".join(lines)
 
-    def chunk_outconv(self, function: str, params: Dict[str, ParamSpec]) -> str:
+    def chunk_outconv(
+        self,
+        spec: FunctionDescriptor,
+        params: Dict[str, ParamSpec],
+        types: Dict[str, TypeDescriptor],
+    ) -> str:
         """The output conversions, this is quite difficult. A function
         may report its results in two ways: by returning it directly
         or by setting a variable to which a pointer was passed. igraph
@@ -359,28 +382,23 @@ class JavaCCodeGenerator(JavaCodeGenerator):
         the Java interface.
         """
 
-        spec = self.get_function_descriptor(function)
-
-        def do_par(pname):
+        def do_par(pname: str, param: ParamSpec) -> str:
             cname = "c_" + pname
             jname = "j_" + pname
-            t = self.get_type_descriptor(params[pname].type)
-            outconv = t.get_output_conversion_template_for(params[pname].mode)
-            if outconv:
-                outconv = indent(outconv)
-            return outconv.replace("%C%", cname).replace("%I%", jname)
+            t = types[pname]
+            outconv = t.get_output_conversion_template_for(param.mode)
+            return replace_placeholders(indent(outconv), {"C": cname, "I": jname})
 
-        outconv = [do_par(n) for n in params]
-        outconv = [o for o in outconv if o != ""]
+        outconv = [o for o in starmap(do_par, params.items()) if o]
 
         retpars = [(n, p) for n, p in params.items() if p.is_output]
         if len(retpars) == 0:
             # return the return value of the function
             rt = self.get_type_descriptor(spec.return_type)
             retconv = rt.get_output_conversion_template_for(ParamMode.OUT)
-            if retconv:
-                retconv = indent(retconv)
-            retconv = retconv.replace("%C%", "c__result").replace("%I%", "result")
+            retconv = replace_placeholders(
+                indent(retconv), {"C": "c__result", "I": "result"}
+            )
             if len(retconv) > 0:
                 outconv.append(retconv)
             ret = "\n".join(outconv)
@@ -400,11 +418,7 @@ class JavaCCodeGenerator(JavaCodeGenerator):
             ret = "\n".join(outconv)
         else:
             raise StimulusError(
-                "{}: the case of multiple outputs not supported yet".format(function)
+                "{}: the case of multiple outputs not supported yet".format(spec.name)
             )
 
         return ret
-
-    def chunk_after(self, function, params):
-        """We simply call Java_igraph_after"""
-        return "  Java_igraph_after();"
@@ -1,5 +1,7 @@
 """Code generators for an experimental generated Python interface of igraph."""
 
+import re
+
 from contextlib import contextmanager, ExitStack
 from dataclasses import dataclass
 from functools import lru_cache
@@ -11,24 +13,26 @@ from stimulus.model.parameters import DefaultValueType, ParamMode, ParamSpec
 from stimulus.model.types import TypeDescriptor
 
 from .base import SingleBlockCodeGenerator
-from .utils import create_indentation_function, remove_prefix
+from .utils import create_indentation_function, remove_prefix, replace_placeholders
 
 
 indent = create_indentation_function("    ")
 
+#: Regular expression that splits a C argument type into its base type and
+#: the pointer asterisks that follow it, dropping any leading "const"
+#: qualifiers
+_C_ARG_TYPE_REGEXP = re.compile(
+    r"\s*(?:const\s+)*(?P<base>.*?)\s*(?P<pointers>(?:\*\s*)*)", re.DOTALL
+)
 
-@lru_cache(maxsize=128)
-def _get_ctypes_arg_type_from_c_arg_type(c_type: str):
-    # Strip "const" from the front
-    c_type = c_type.strip()
-    while c_type.startswith("const "):
-        c_type = c_type[6:].strip()
 
-    # Replace pointer asterisks
-    wrap_counter = 0
-    while c_type.endswith("*"):
-        c_type = c_type[:-1].strip()
-        wrap_counter += 1
+@lru_cache(maxsize=None)
+def _get_ctypes_arg_type_from_c_arg_type(c_type: str):
+    # Strip "const" from the front and count the pointer asterisks at the end
+    match = _C_ARG_TYPE_REGEXP.fullmatch(c_type)
+    assert match is not None  # the regexp matches any string
+    c_type = match.group("base")
+    wrap_counter = match.group("pointers").count("*")
 
     # Add c_ prefix if needed
     if c_type in (
@@ -372,10 +376,9 @@ class ArgInfo:
         return self.type_spec.has_flag("stack")
 
     def _apply_replacements(self, value: str, args: Dict[str, "ArgInfo"]) -> str:
-        value = value.replace("%I%", self.py_name)
-        value = value.replace("%C%", self.c_name)
+        replacements = {"I": self.py_name, "C": self.c_name}
         if self.needs_exit_stack:
-            value = value.replace("%S%", "py__stack")
+            replacements["S"] = "py__stack"
 
         for index, dep in enumerate(self.param_spec.dependencies, 1):
             arg = args.get(dep)
@@ -383,10 +386,10 @@ class ArgInfo:
                 raise CodeGenerationError(
                     f"Unknown dependency for parameter {self.py_name!r}: {dep!r}"
                 )
-            value = value.replace(f"%I{index}%", arg.py_name)
-            value = value.replace(f"%C{index}%", arg.c_name)
+            replacements[f"I{index}"] = arg.py_name
+            replacements[f"C{index}"] = arg.c_name
 
-        return value
+        return replace_placeholders(value, replacements)
 
 
 class PythonCTypesTypedWrapperCodeGenerator(SingleBlockCodeGenerator):
@@ -417,6 +420,10 @@ class PythonCTypesTypedWrapperCodeGenerator(SingleBlockCodeGenerator):
         # Construct Python arguments
         args = self._process_argument_list(spec)
 
+        # The ArgInfo objects of the parameters in their original (C) order;
+        # they are needed several times below
+        c_order_args = [args[param_spec.name] for param_spec in spec.iter_parameters()]
+
         # Decide in which order the arguments should appear on the Python side.
         # Arguments with no default values must appear earlier even if they are
         # declared later on the C side. Python's sort is stable so the code
@@ -435,7 +442,7 @@ class PythonCTypesTypedWrapperCodeGenerator(SingleBlockCodeGenerator):
 
         # Determine return type and argument ordering
         py_return_type, return_arg_names, return_types = self._get_return_type_and_args(
-            spec
+            spec, args
         )
         py_args = [
             args[arg_spec.name].get_python_declaration() for arg_spec in arg_specs
@@ -454,16 +461,13 @@ class PythonCTypesTypedWrapperCodeGenerator(SingleBlockCodeGenerator):
         write(f"def {py_name}({', '.join(py_args)}) -> {py_return_type}:")
 
         # Print documentation string (if any)
-        docstring = self.docstring_provider(spec.name) or (
+        docstring = self._docstring_provider(spec.name) or (
             f"Type-annotated wrapper for ``{spec.name}``."
         )
         write(_format_docstring(docstring))
 
         # Check whether we will need an exit stack in the generated code
-        needs_exit_stack = any(
-            args[param_spec.name].needs_exit_stack
-            for param_spec in spec.iter_parameters()
-        )
+        needs_exit_stack = any(arg.needs_exit_stack for arg in c_order_args)
 
         with ExitStack() as stack:
             stack.enter_context(writer.indent())
@@ -477,10 +481,8 @@ class PythonCTypesTypedWrapperCodeGenerator(SingleBlockCodeGenerator):
 
             # Add input conversion calls
             convs = [
-                args[param_spec.name].get_input_conversion(args)
-                for param_spec in spec.iter_parameters()
+                conv for arg in c_order_args if (conv := arg.get_input_conversion(args))
             ]
-            convs = [conv for conv in convs if conv]
             if convs:
                 write("# Prepare input arguments")
                 for conv in convs:
@@ -490,8 +492,7 @@ class PythonCTypesTypedWrapperCodeGenerator(SingleBlockCodeGenerator):
             write("# Call wrapped function")
             needs_return_value_from_c_call = "" in return_arg_names
             c_args = ", ".join(
-                args[arg_spec.name].get_argument_for_function_call(args)
-                for arg_spec in spec.iter_parameters()
+                arg.get_argument_for_function_call(args) for arg in c_order_args
             )
             c_call = f"{name}({c_args})"
             if needs_return_value_from_c_call:
@@ -500,10 +501,10 @@ class PythonCTypesTypedWrapperCodeGenerator(SingleBlockCodeGenerator):
 
             # Add output conversion calls
             convs = [
-                args[param_spec.name].get_output_conversion(args)
-                for param_spec in spec.iter_parameters()
+                conv
+                for arg in c_order_args
+                if (conv := arg.get_output_conversion(args))
             ]
-            convs = [conv for conv in convs if conv]
             if convs:
                 write("")
                 write("# Prepare output arguments")
@@ -524,7 +525,9 @@ class PythonCTypesTypedWrapperCodeGenerator(SingleBlockCodeGenerator):
                     )
 
                 if tmpl:
-                    conv = tmpl.replace("%I%", "py__result").replace("%C%", "c__result")
+                    conv = replace_placeholders(
+                        tmpl, {"I": "py__result", "C": "c__result"}
+                    )
                     return_var = "py__result"
                     write("")
                     write("# Prepare return value")
@@ -557,12 +560,16 @@ class PythonCTypesTypedWrapperCodeGenerator(SingleBlockCodeGenerator):
         return spec.get("NAME") or remove_prefix(spec.name, "igraph_")
 
     def _get_return_type_and_args(
-        self, spec: FunctionDescriptor
+        self, spec: FunctionDescriptor, args: Dict[str, ArgInfo]
     ) -> Tuple[str, List[str], List[TypeDescriptor]]:
         """Returns the return type of the given function, the names of the
         C arguments from which the output arguments are created and the
         corresponding type descriptors.
 
+        The type descriptors of the arguments are taken from the given
+        argument list as returned by `_process_argument_list()` so they are
+        not looked up again.
+
         An empty string in the returned argument list means that the return
         value of the C function should be converted into the return value of
         the Python function.
@@ -595,7 +602,7 @@ class PythonCTypesTypedWrapperCodeGenerator(SingleBlockCodeGenerator):
         for parameter in spec.iter_parameters():
             if not parameter.is_deprecated and not parameter.is_input:
                 arg_names.append(parameter.name)
-                arg_types.append(self.get_type_descriptor(parameter.type))
+                arg_types.append(args[parameter.name].type_spec)
 
         arg_type_strs = []
         for arg_spec in arg_types:
@@ -6,26 +6,59 @@ TODO: free memory when CTRL+C pressed, even on Windows
 import re
 
 from shlex import quote
-from typing import Iterable, IO, Optional, Tuple
+from typing import Any, Dict, Iterable, IO, Optional, Tuple
 
 from stimulus.errors import NoSuchTypeError
-from stimulus.model import ParamMode, ParamSpec
+from stimulus.model import ParamMode, ParamSpec, TypeDescriptor
 from stimulus.model.functions import FunctionDescriptor
 
 from .base import (
     BlockBasedCodeGenerator,
     SingleBlockCodeGenerator,
 )
-from .utils import create_indentation_function
+from .utils import (
+    create_indentation_function,
+    get_dependency_placeholders,
+    replace_placeholders,
+)
 
 
 indent = create_indentation_function("  ")
 
+#: Regular expression matching %I% tokens and the numbered %I1%, %I2% etc.
+#: tokens that refer to the dependencies of a parameter
+_I_TOKEN_REGEXP = re.compile("%I[0-9]*%")
+
+#: Regular expression matching the numbered %I1%, %I2% etc. tokens only
+_NUMBERED_I_TOKEN_REGEXP = re.compile("%I[0-9]+%")
+
 init_functions = {
     "igraph_vector_int_t": "IGRAPH_R_CHECK(igraph_vector_int_init(&%C%, 0));\nIGRAPH_FINALLY(igraph_vector_int_destroy, &%C%);"
 }
 
 
+#: Template of the C glue code generated for a single function by the R-C
+#: code generator
+_RC_FUNCTION_TEMPLATE = """
+/*-------------------------------------------/
+/ {func:<42} /
+/-------------------------------------------*/
+{header} {{
+                                        /* Declarations */
+{decl}
+                                        /* Convert input */
+{inconv}
+                                        /* Call igraph */
+{call}
+                                        /* Convert output */
+{outconv}
+
+  UNPROTECT(1);
+  return(r_result);
+}}
+"""
+
+
 def get_r_parameter_name(param: ParamSpec) -> str:
     result = param.name_in_higher_level_interface
     if result == param.name:
@@ -55,12 +88,26 @@ def optional_wrapper_r(conv: str) -> str:
 
 
 class RRCodeGenerator(SingleBlockCodeGenerator):
+    _gattr_cache: Dict[str, str]
+
+    def __init__(self):
+        super().__init__()
+        self._gattr_cache = {}
+
+    def load_function_descriptors_from_object(self, obj: Dict[str, Any]) -> None:
+        super().load_function_descriptors_from_object(obj)
+        self._gattr_cache.clear()
+
     def generate_function(self, function: str, out: IO[str]) -> None:
         # Check types
         self.check_types_of_function(function)
 
-        # Get function specification
+        # Get function specification and the types of its parameters
         spec = self.get_function_descriptor(function)
+        types = self.get_parameter_type_descriptors(spec)
+        r_names = {
+            param.name: get_r_parameter_name(param) for param in spec.iter_parameters()
+        }
 
         # Derive name of R function
         name = spec.get_name_in_generated_code("R")
@@ -93,17 +140,24 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
             spec.has_primary_output_parameter and spec.has_non_primary_output_parameter
         )
 
-        out.write(name)
-        out.write("_impl <- function(")
+        # Collect the generated code in a list and write it in one go at the end
+        buf = []
+        emit = buf.append
+
+        emit(name)
+        emit("_impl <- function(")
 
         def handle_input_argument(param: ParamSpec) -> str:
             tname = param.type
-            type_desc = self.get_type_descriptor(tname)
-            header = name_in_r_interface = get_r_parameter_name(param)
+            type_desc = types[param.name]
+            header = name_in_r_interface = r_names[param.name]
             if "HEADER" in type_desc:
                 header = type_desc["HEADER"] or ""
+            deps = get_dependency_placeholders(param, "I")
             if header:
-                header = header.replace("%I%", name_in_r_interface)
+                header = replace_placeholders(
+                    header, {"I": name_in_r_interface, **deps}
+                )
             else:
                 header = ""
 
@@ -111,31 +165,20 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
                 "NULL" if param.is_optional and header else ""
             )
             if default:
-                header = f"{header}={default}"
+                header = f"{header}={replace_placeholders(default, deps)}"
 
-            for i, dep in enumerate(param.dependencies):
-                header = header.replace("%I" + str(i + 1) + "%", dep)
-
-            if re.search("%I[0-9]*%", header):
+            if "%" in header and _I_TOKEN_REGEXP.search(header):
                 self.log.error(
                     f"Missing HEADER dependency for {tname} {param.name} in function {function}"
                 )
 
             return header
 
-        head = [
-            handle_input_argument(param)
-            for param in spec.iter_input_parameters(reorder=True)
-            if not param.is_keyword_only
-        ]
-        head = [h for h in head if h != ""]
-
-        head2 = [
-            handle_input_argument(param)
-            for param in spec.iter_input_parameters(reorder=True)
-            if param.is_keyword_only
-        ]
-        head2 = [h for h in head2 if h != ""]
+        head, head2 = [], []
+        for param in spec.iter_input_parameters(reorder=True):
+            header = handle_input_argument(param)
+            if header:
+                (head2 if param.is_keyword_only else head).append(header)
 
         if head2:
             head.append("...")
@@ -148,7 +191,7 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
             if "details" in head:
                 # We already have another parameter named "details" so we
                 # pretend that we don't have primary output parameters
-                self.log.warn(
+                self.log.warning(
                     f"Primary parameters declared for function {function}, which already "
                     f"has an argument named 'details'; not adding another one."
                 )
@@ -156,8 +199,8 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
         if needs_details_arg:
             head.append("details=FALSE")
 
-        out.write(", ".join(head))
-        out.write(") {\n")
+        emit(", ".join(head))
+        emit(") {\n")
 
         ## Argument checks, INCONV
         ##
@@ -169,25 +212,29 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
 
         ## The INCONV fields are simply concatenated by newline
         ## characters.
-        out.write("  # Argument checks\n")
+        emit("  # Argument checks\n")
 
         if has_dots_arg:
-            out.write("  check_dots_empty()\n")
+            emit("  check_dots_empty()\n")
 
         def handle_argument_check(param: ParamSpec) -> str:
             tname = param.type
-            t = self.get_type_descriptor(tname)
+            t = types[param.name]
             res = t.get_input_conversion_template_for(param.mode)
 
             if param.is_optional and param.is_input and res:
                 res = optional_wrapper_r(res)
 
             # Replace template placeholders
-            res = indent(res).replace("%I%", get_r_parameter_name(param))
-            for i, dep in enumerate(param.dependencies):
-                res = res.replace("%I" + str(i + 1) + "%", dep)
+            res = replace_placeholders(
+                indent(res),
+                {
+                    "I": r_names[param.name],
+                    **get_dependency_placeholders(param, "I"),
+                },
+            )
 
-            if re.search("%I[0-9]*%", res):
+            if "%" in res and _I_TOKEN_REGEXP.search(res):
                 self.log.error(
                     f"Missing IN dependency for {tname} {param.name} in function {function}"
                 )
@@ -196,7 +243,7 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
 
         inconv = [handle_argument_check(param) for param in spec.iter_parameters()]
         inconv = [i for i in inconv if i != ""]
-        out.write("\n".join(inconv) + "\n\n")
+        emit("\n".join(inconv) + "\n\n")
 
         ## Function call
         ## This is a bit more difficult than INCONV. Here we supply
@@ -208,21 +255,21 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
         ## completely ignored, so giving an empty CALL field is
         ## different than not giving it at all.
 
-        out.write("  on.exit( .Call(R_igraph_finalizer) )\n")
-        out.write("  # Function call\n")
-        out.write("  res <- .Call(R_" + function)
+        emit("  on.exit( .Call(R_igraph_finalizer) )\n")
+        emit("  # Function call\n")
+        emit("  res <- .Call(R_" + function)
 
         parts = []
         for param in spec.iter_input_parameters():
-            type = self.get_type_descriptor(param.type)
-            name = get_r_parameter_name(param)
+            type = types[param.name]
+            name = r_names[param.name]
             call = type.get("CALL", name)
             if call:
                 parts.append(call.replace("%I%", name))
 
         if len(parts):
-            out.write(", " + ", ".join(parts))
-        out.write(")\n")
+            emit(", " + ", ".join(parts))
+        emit(")\n")
 
         ## Output conversions
         def handle_output_argument(
@@ -232,21 +279,22 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
             iprefix: str = "",
         ):
             if realname is None:
-                realname = get_r_parameter_name(param)
+                realname = r_names[param.name]
 
             tname = param.type
-            t = self.get_type_descriptor(tname)
-            outconv = indent(t.get_output_conversion_template_for(param.mode))
-            outconv = outconv.replace("%I%", iprefix + realname)
-            for i, dep in enumerate(param.dependencies):
-                outconv = outconv.replace("%I" + str(i + 1) + "%", dep)
+            t = types[param.name]
+            outconv = replace_placeholders(
+                indent(t.get_output_conversion_template_for(param.mode)),
+                {"I": iprefix + realname, **get_dependency_placeholders(param, "I")},
+            )
 
-            if re.search("%I[0-9]*%", outconv):
+            if "%" in outconv and _I_TOKEN_REGEXP.search(outconv):
                 self.log.error(
                     f"Missing OUT dependency for {tname} {param.name} in function {function}"
                 )
+                outconv = _NUMBERED_I_TOKEN_REGEXP.sub("", outconv)
 
-            return re.sub("%I[0-9]+%", "", outconv)
+            return outconv
 
         retpars = [param.name for param in spec.iter_output_parameters()]
 
@@ -293,7 +341,7 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
             else:
                 # just use the output arguments as they are
                 pass
-        out.write("\n".join(outconv) + "\n")
+        emit("\n".join(outconv) + "\n")
 
         ## Some graph attributes to add
         if "R" not in spec:
@@ -309,49 +357,70 @@ class RRCodeGenerator(SingleBlockCodeGenerator):
         r_spec = spec._obj.get("R", {})
 
         ## Add graph attributes
-        if "GATTR" in r_spec or "GATTR-PARAM" in r_spec:
-            gattrs_dict = {}
-            lines = []
-
-            gattrs = r_spec.get("GATTR")
-            pars = r_spec.get("GATTR-PARAM")
-
-            if isinstance(gattrs, dict):
-                gattrs_dict.update(gattrs)
-            elif gattrs is not None:
-                for item in gattrs.split(","):
-                    name, value = item.split(" IS ", 1)
-                    name = name.strip()
-                    value = value.strip()
-                    gattrs_dict[name] = value
-
-            if gattrs_dict:
-                lines.extend(
-                    f"res${name} <- {val!r}" for name, val in gattrs_dict.items()
-                )
-
-            if pars is not None:
-                if isinstance(pars, str):
-                    pars = pars.split(",")
-                for par in pars:
-                    par = par.strip().replace("_", ".")
-                    lines.append(f"res${par} <- {par}")
-
-            if lines:
-                out.write('  if (igraph_opt("add.params")) {\n')
-                for line in lines:
-                    out.write(indent(indent(line)) + "\n")
-                out.write("  }\n\n")
+        emit(self._get_graph_attribute_block(function, r_spec))
 
         ## Set the class if requested
         if "CLASS" in r_spec:
-            out.write(f'  class(res) <- "{r_spec["CLASS"]}"\n')
+            emit(f'  class(res) <- "{r_spec["CLASS"]}"\n')
 
         ## See if there is a postprocessor
         if "PP" in r_spec:
-            out.write(f'  res <- {r_spec["PP"]}(res)\n')
+            emit(f'  res <- {r_spec["PP"]}(res)\n')
+
+        emit("  res\n}\n\n")
+
+        out.write("".join(buf))
+
+    def _get_graph_attribute_block(self, function: str, r_spec: Dict[str, Any]) -> str:
+        """Returns the R code that adds the graph attributes declared in the
+        R-specific part of the specification of the given function to the
+        result.
+
+        The result is cached per function so the GATTR and GATTR-PARAM
+        specifications are parsed only once.
+        """
+        block = self._gattr_cache.get(function)
+        if block is not None:
+            return block
+
+        gattrs_dict = {}
+        lines = []
+
+        gattrs = r_spec.get("GATTR")
+        pars = r_spec.get("GATTR-PARAM")
+
+        if isinstance(gattrs, dict):
+            gattrs_dict.update(gattrs)
+        elif gattrs is not None:
+            for item in gattrs.split(","):
+                name, value = item.split(" IS ", 1)
+                name = name.strip()
+                value = value.strip()
+                gattrs_dict[name] = value
+
+        if gattrs_dict:
+            lines.extend(f"res${name} <- {val!r}" for name, val in gattrs_dict.items())
+
+        if pars is not None:
+            if isinstance(pars, str):
+                pars = pars.split(",")
+            for par in pars:
+                par = par.strip().replace("_", ".")
+                lines.append(f"res${par} <- {par}")
+
+        if lines:
+            block = "".join(
+                [
+                    '  if (igraph_opt("add.params")) {\n',
+                    *(indent(indent(line)) + "\n" for line in lines),
+                    "  }\n\n",
+                ]
+            )
+        else:
+            block = ""
 
-        out.write("  res\n}\n\n")
+        self._gattr_cache[function] = block
+        return block
 
 
 class RCCodeGenerator(SingleBlockCodeGenerator):
@@ -360,6 +429,7 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
         self.check_types_of_function(function, errors="error")
 
         desc = self.get_function_descriptor(function)
+        types = self.get_parameter_type_descriptors(desc)
 
         ## Compile the output
         ## This code generator is quite difficult, so we use different
@@ -368,37 +438,18 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
         ## See the documentation of each chunk below.
         res = {}
         res["func"] = function
-        res["header"] = self.chunk_header(desc)
-        res["decl"] = self.chunk_declaration(desc)
-        res["inconv"] = self.chunk_inconv(desc)
-        res["call"] = self.chunk_call(desc)
-        res["outconv"] = self.chunk_outconv(desc)
+        res["header"] = self.chunk_header(desc, types)
+        res["decl"] = self.chunk_declaration(desc, types)
+        res["inconv"] = self.chunk_inconv(desc, types)
+        res["call"] = self.chunk_call(desc, types)
+        res["outconv"] = self.chunk_outconv(desc, types)
 
         # Replace into the template
-        text = (
-            """
-/*-------------------------------------------/
-/ %(func)-42s /
-/-------------------------------------------*/
-%(header)s {
-                                        /* Declarations */
-%(decl)s
-                                        /* Convert input */
-%(inconv)s
-                                        /* Call igraph */
-%(call)s
-                                        /* Convert output */
-%(outconv)s
-
-  UNPROTECT(1);
-  return(r_result);
-}\n"""
-            % res
-        )
-
-        out.write(text)
+        out.write(_RC_FUNCTION_TEMPLATE.format_map(res))
 
-    def chunk_header(self, desc: FunctionDescriptor) -> str:
+    def chunk_header(
+        self, desc: FunctionDescriptor, types: Dict[str, TypeDescriptor]
+    ) -> str:
         """The header. All functions return with a 'SEXP', so this is
         easy. We just take the 'IN' and 'INOUT' arguments, all will
         have type SEXP, and concatenate them by commas. The function name
@@ -406,7 +457,7 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
         """
 
         def do_par(spec: ParamSpec) -> str:
-            t = self.get_type_descriptor(spec.type)
+            t = types[spec.name]
             if "HEADER" in t:
                 if t["HEADER"]:
                     return t["HEADER"].replace("%I%", spec.name)
@@ -419,7 +470,9 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
         inout = ["SEXP " + n for n in inout if n != ""]
         return "SEXP R_" + desc.name + "(" + (", ".join(inout) or "void") + ")"
 
-    def chunk_declaration(self, desc: FunctionDescriptor) -> str:
+    def chunk_declaration(
+        self, desc: FunctionDescriptor, types: Dict[str, TypeDescriptor]
+    ) -> str:
         """There are a couple of things to declare. First a C type is
         needed for every argument, these will be supplied in the C
         igraph call. Then, all 'OUT' arguments need a SEXP variable as
@@ -431,18 +484,17 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
         """
 
         def do_par(spec: ParamSpec) -> str:
-            type_desc = self.get_type_descriptor(spec.type)
+            type_desc = types[spec.name]
             try:
                 return type_desc.declare_c_variable(f"c_{spec.name}", mode=spec.mode)
             except NoSuchTypeError:
                 return f"/* {spec.name} has no corresponding C type */"
 
-        inout = [do_par(spec) for spec in desc.iter_parameters()]
-        out = [
-            f"SEXP {spec.name};"
-            for spec in desc.iter_parameters()
-            if spec.mode is ParamMode.OUT
-        ]
+        inout, out = [], []
+        for spec in desc.iter_parameters():
+            inout.append(do_par(spec))
+            if spec.mode is ParamMode.OUT:
+                out.append(f"SEXP {spec.name};")
 
         retpars = [spec.name for spec in desc.iter_output_parameters()]
 
@@ -455,7 +507,9 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
             res = "\n".join(inout + out + [retdecl] + ["SEXP r_result, r_names;"])
         return indent(res)
 
-    def chunk_inconv(self, desc: FunctionDescriptor) -> str:
+    def chunk_inconv(
+        self, desc: FunctionDescriptor, types: Dict[str, TypeDescriptor]
+    ) -> str:
         """Input conversions. Not only for types with mode 'IN' and
         'INOUT', eg. for 'OUT' vector types we need to allocate the
         required memory here, do all the initializations, etc. Types
@@ -465,7 +519,7 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
 
         def do_par(param: ParamSpec) -> str:
             cname = "c_" + param.name
-            t = self.get_type_descriptor(param.type)
+            t = types[param.name]
 
             # Get the template from the type specification
             inconv = t.get_input_conversion_template_for(param.mode)
@@ -482,17 +536,23 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
                 inconv = optional_wrapper_c(inconv, c_type)
 
             # Replace the tokens in the type specification
-            for i, dep in enumerate(param.dependencies):
-                inconv = inconv.replace("%C" + str(i + 1) + "%", "c_" + dep)
-
-            return indent(inconv).replace("%C%", cname).replace("%I%", param.name)
+            return replace_placeholders(
+                indent(inconv),
+                {
+                    "C": cname,
+                    "I": param.name,
+                    **get_dependency_placeholders(param, "C", "c_"),
+                },
+            )
 
         inconv = [do_par(param) for param in desc.iter_parameters()]
         inconv = [i for i in inconv if i != ""]
 
         return "\n".join(inconv)
 
-    def chunk_call(self, desc: FunctionDescriptor) -> str:
+    def chunk_call(
+        self, desc: FunctionDescriptor, types: Dict[str, TypeDescriptor]
+    ) -> str:
         """Every single argument is included, independently of their
         mode. If a type has a 'CALL' field then that is used after the
         usual %C% and %I% substitutions, otherwise the standard 'c_'
@@ -501,7 +561,7 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
 
         calls = []
         for param in desc.iter_parameters():
-            t = self.get_type_descriptor(param.type)
+            t = types[param.name]
             type = t.get("CALL", f"c_{param.name}")
 
             if isinstance(type, dict):
@@ -517,7 +577,9 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
                     and call != "0"
                 ):
                     call = f"(Rf_isNull(%I%) ? NULL : {call})"
-                call = call.replace("%C%", f"c_{param.name}").replace("%I%", param.name)
+                call = replace_placeholders(
+                    call, {"C": f"c_{param.name}", "I": param.name}
+                )
                 calls.append(call)
 
         calls = ", ".join(calls)
@@ -536,7 +598,9 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
 
         return res
 
-    def chunk_outconv(self, spec: FunctionDescriptor) -> str:
+    def chunk_outconv(
+        self, spec: FunctionDescriptor, types: Dict[str, TypeDescriptor]
+    ) -> str:
         """The output conversions, this is quite difficult. A function
         may report its results in two ways: by returning it directly
         or by setting a variable to which a pointer was passed. igraph
@@ -562,14 +626,17 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
 
         def do_par(param: ParamSpec) -> str:
             cname = f"c_{param.name}"
-            t = self.get_type_descriptor(param.type)
+            t = types[param.name]
             outconv = t.get_output_conversion_template_for(param.mode)
 
-            outconv = indent(outconv)
-            for i, dep in enumerate(param.dependencies):
-                outconv = outconv.replace("%C" + str(i + 1) + "%", "c_" + dep)
-
-            return outconv.replace("%C%", cname).replace("%I%", param.name)
+            return replace_placeholders(
+                indent(outconv),
+                {
+                    "C": cname,
+                    "I": param.name,
+                    **get_dependency_placeholders(param, "C", "c_"),
+                },
+            )
 
         outconv = [do_par(param) for param in spec.iter_parameters()]
         outconv = [o for o in outconv if o != ""]
@@ -578,7 +645,7 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
         # in C.
         retpars = []
         for param in spec.iter_output_parameters():
-            type_desc = self.get_type_descriptor(param.type)
+            type_desc = types[param.name]
             if type_desc.get_c_type(param.mode) is not None:
                 retpars.append(param)
 
@@ -586,7 +653,7 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
             # return the return value of the function
             rt = self.get_type_descriptor(spec.return_type)
             retconv = indent(rt.get_output_conversion_template_for(ParamMode.OUT))
-            retconv = retconv.replace("%C%", "c_result").replace("%I%", "r_result")
+            retconv = replace_placeholders(retconv, {"C": "c_result", "I": "r_result"})
             ret = "\n".join(outconv) + "\n" + retconv
         elif len(retpars) == 1:
             # return the single output value
@@ -594,24 +661,22 @@ class RCCodeGenerator(SingleBlockCodeGenerator):
             ret = "\n".join(outconv) + "\n" + retconv
         else:
             # create a list of output values
-            sets = [
+            lines = [
+                f"  PROTECT(r_result=NEW_LIST({len(retpars)}));",
+                f"  PROTECT(r_names=NEW_CHARACTER({len(retpars)}));",
+            ]
+            lines.extend(outconv)
+            lines.extend(
                 f"  SET_VECTOR_ELT(r_result, {index}, {param.name});"
                 for index, param in enumerate(retpars)
-            ]
-            names = [
+            )
+            lines.extend(
                 f'  SET_STRING_ELT(r_names, {index}, Rf_mkChar("{param.name_in_higher_level_interface}"));'
                 for index, param in enumerate(retpars)
-            ]
-            ret = "\n".join(
-                [
-                    f"  PROTECT(r_result=NEW_LIST({len(retpars)}));",
-                    f"  PROTECT(r_names=NEW_CHARACTER({len(retpars)}));",
-                ]
-                + outconv
-                + sets
-                + names
-                + ["  SET_NAMES(r_result, r_names);", f"  UNPROTECT({len(sets) + 1});"]
             )
+            lines.append("  SET_NAMES(r_result, r_names);")
+            lines.append(f"  UNPROTECT({len(retpars) + 1});")
+            ret = "\n".join(lines)
 
         return ret
 
@@ -638,10 +703,18 @@ class RInitCodeGenerator(BlockBasedCodeGenerator):
         return in_args, out_args
 
     def generate_declarations_block(self, out: IO[str]) -> None:
-        for name in self.iter_functions():
-            self.generate_declaration(name, out)
+        out.write("".join(map(self._format_declaration, self.iter_functions())))
 
     def generate_declaration(self, name: str, out: IO[str]) -> None:
+        out.write(self._format_declaration(name))
+
+    def generate_function(self, name: str, out: IO[str]) -> None:
+        out.write(self._format_function(name))
+
+    def generate_functions_block(self, out: IO[str]) -> None:
+        out.write("".join(map(self._format_function, self.iter_functions())))
+
+    def _format_declaration(self, name: str) -> str:
         num_input_args, num_output_args = self._count_arguments(name)
 
         # One output argument is used for the return value. The default generated
@@ -649,13 +722,13 @@ class RInitCodeGenerator(BlockBasedCodeGenerator):
         num_r_args = num_input_args
 
         args = ", ".join(["SEXP"] * num_r_args) or "void"
-        out.write(f"extern SEXP R_{name}({args});\n")
+        return f"extern SEXP R_{name}({args});\n"
 
-    def generate_function(self, name: str, out: IO[str]) -> None:
+    def _format_function(self, name: str) -> str:
         num_input_args, num_output_args = self._count_arguments(name)
         num_r_args = "{:>2}".format(num_input_args)
         padding = " " * (50 - len(name))
-        out.write(
+        return (
             f'    {{"R_{name}",{padding}(DL_FUNC) &R_{name},{padding}{num_r_args}}},\n'
         )
 
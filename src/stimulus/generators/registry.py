@@ -23,24 +23,27 @@ def get_code_generator_factory_for_language(
     """Returns the class or factory function that is responsible for generating
     code in the given language.
     """
-    global _registry_initialized, _registry
-
-    if not _registry_initialized:
-        _register_code_generators()
-        _registry_initialized = True
-
-    return _registry[lang]
+    return _get_registry()[lang]
 
 
 def is_valid_language(lang: str) -> bool:
     """Returns whether there is a class or factory function that is responsible
     for generating code in the given language.
     """
-    try:
-        get_code_generator_factory_for_language(lang)
-        return True
-    except KeyError:
-        return False
+    return lang in _get_registry()
+
+
+def _get_registry() -> Dict[str, Callable[[], CodeGenerator]]:
+    """Returns the registry, initializing it with the code generators of the
+    project upon the first call.
+    """
+    global _registry_initialized
+
+    if not _registry_initialized:
+        _register_code_generators()
+        _registry_initialized = True
+
+    return _registry
 
 
 def _register_code_generators() -> None:
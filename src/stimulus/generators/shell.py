@@ -2,10 +2,10 @@
 from the command line.
 """
 
-from collections import OrderedDict
+from itertools import starmap
 from typing import Any, Dict, IO
 
-from stimulus.model import ParamMode, ParamSpec
+from stimulus.model import ParamMode, ParamSpec, TypeDescriptor
 
 from .base import SingleBlockCodeGenerator
 from .utils import create_indentation_function
@@ -27,96 +27,138 @@ indent = create_indentation_function("  ")
 
 FUNCTION_TEMPLATE = """\
 /*-------------------------------------------/
-/ %(func)-42s /
+/ {func:<42} /
 /-------------------------------------------*/
-void shell_%(func)s_usage(char **argv) {
-%(usage)s
+void shell_{func}_usage(char **argv) {{
+{usage}
   exit(1);
-}
+}}
 
-int shell_%(func)s(int argc, char **argv) {
+int shell_{func}(int argc, char **argv) {{
 
-%(decl)s
+{decl}
 
-  int shell_seen[%(nargs)s];
+  int shell_seen[{nargs}];
   int shell_index=-1;
-  struct option shell_options[]= { %(args)s
-                                   { "help", no_argument, 0, %(nargs)s },
-                                   { 0, 0, 0, 0 }
-                                 };
+  struct option shell_options[]= {{ {args}
+                                   {{ "help", no_argument, 0, {nargs} }},
+                                   {{ 0, 0, 0, 0 }}
+                                 }};
 
   /* 0 - not seen, 1 - seen as argument, 2 - seen as default */
-  memset(shell_seen, 0, %(nargs)s*sizeof(int));
-%(default)s
+  memset(shell_seen, 0, {nargs}*sizeof(int));
+{default}
 
   /* Parse arguments and read input */
-  while (getopt_long(argc, argv, "", shell_options, &shell_index) != -1) {
+  while (getopt_long(argc, argv, "", shell_options, &shell_index) != -1) {{
 
-    if (shell_index==-1) {
+    if (shell_index==-1) {{
       exit(1);
-    }
+    }}
 
-    if (shell_seen[shell_index]==1) {
-      fprintf(stderr, "Error, `--%%s' argument given twice.\\n",
+    if (shell_seen[shell_index]==1) {{
+      fprintf(stderr, "Error, `--%s' argument given twice.\\n",
               shell_options[shell_index].name);
       exit(1);
-    }
+    }}
     shell_seen[shell_index]=1;
-%(inconv)s
+{inconv}
     shell_index=-1;
-  }
+  }}
 
   /* Check that we have all arguments */
-  for (shell_index=0; shell_index<%(nargs)s; shell_index++) {
-    if (!shell_seen[shell_index]) {
-      fprintf(stderr, "Error, argument missing: `--%%s'.\\n",
+  for (shell_index=0; shell_index<{nargs}; shell_index++) {{
+    if (!shell_seen[shell_index]) {{
+      fprintf(stderr, "Error, argument missing: `--%s'.\\n",
               shell_options[shell_index].name);
       exit(1);
-    }
-  }
+    }}
+  }}
 
   /* Do the operation */
-%(call)s
+{call}
 
   /* Write the result */
-%(outconv)s
+{outconv}
 
   return 0;
+}}
+"""
+
+DISPATCHER_TABLE_HEADER = """\
+typedef struct {
+  const char *name;
+  int (*func)(int argc, char **argv);
+} shell_function_t;
+
+static const shell_function_t shell_functions[] = {
+"""
+
+DISPATCHER_TABLE_FOOTER = """\
+  { 0, 0 }
+};
+
+static int shell_compare_functions(const void *key, const void *item) {
+  return strcasecmp((const char *) key, ((const shell_function_t *) item)->name);
 }
 """
 
+MAIN_FUNCTION = """\
+int main(int argc, char **argv) {
 
-class ShellCodeGenerator(SingleBlockCodeGenerator):
-    def generate_functions_block(self, out: IO[str]) -> None:
-        out.write("\n/* Function prototypes first */\n\n")
+  const char *base=basename(argv[0]);
+  const shell_function_t *func=bsearch(
+    base, shell_functions,
+    sizeof(shell_functions) / sizeof(shell_functions[0]) - 1,
+    sizeof(shell_functions[0]), shell_compare_functions
+  );
 
-        for name in self.iter_functions():
-            self.generate_prototype(name, out)
+  if (func) {
+    return func->func(argc, argv);
+  }
 
-        out.write("\n/* The main function */\n\n")
-        out.write("int main(int argc, char **argv) {\n\n")
-        out.write("  const char *base=basename(argv[0]);\n\n  ")
+  printf("Unknown function, exiting\\n");
+  shell_igraph_usage(argc, argv);
 
-        for name in self.iter_functions():
-            out.write(
-                f'if (!strcasecmp(base, "{name}")) {{\n'
-                f"    return shell_{name}(argc, argv);\n"
-                f"  }} else "
-            )
+  return 0;
+}
+"""
 
-        out.write('{\n    printf("Unknown function, exiting\\n");\n')
-        out.write("  }\n\n  shell_igraph_usage(argc, argv);\n\n  return 0;\n}\n")
 
-        out.write("\n/* The functions themselves at last */\n")
+class ShellCodeGenerator(SingleBlockCodeGenerator):
+    def generate_functions_block(self, out: IO[str]) -> None:
+        names = list(self.iter_functions())
+
+        parts = ["\n/* Function prototypes first */\n\n"]
+        parts.extend(self._format_prototype(name) for name in names)
+
+        # The dispatcher table must be sorted in the same case-insensitive
+        # order that strcasecmp() uses so we can look up functions with bsearch()
+        parts.append("\n/* The function table, sorted by name */\n\n")
+        parts.append(DISPATCHER_TABLE_HEADER)
+        parts.extend(
+            f'  {{ "{name}", shell_{name} }},\n'
+            for name in sorted(names, key=str.lower)
+        )
+        parts.append(DISPATCHER_TABLE_FOOTER)
+
+        parts.append("\n/* The main function */\n\n")
+        parts.append(MAIN_FUNCTION)
+
+        parts.append("\n/* The functions themselves at last */\n")
+        out.write("".join(parts))
 
-        for name in self.iter_functions():
+        for name in names:
             self.generate_function(name, out)
 
     def generate_prototype(self, name: str, out: IO[str]):
         """Generates the prototype of the C function that will handle the
         function with the given name.
         """
-        out.write(f"int shell_{name}(int argc, char **argv);\n")
+        out.write(self._format_prototype(name))
+
+    def _format_prototype(self, name: str) -> str:
+        return f"int shell_{name}(int argc, char **argv);\n"
 
     def generate_function(self, name: str, out: IO[str]) -> None:
         # Check types
@@ -124,10 +166,11 @@ class ShellCodeGenerator(SingleBlockCodeGenerator):
 
         # Enumerate parameters
         desc = self.get_function_descriptor(name)
-        args = OrderedDict()
+        types = self.get_parameter_type_descriptors(desc)
+        args: Dict[str, Dict[str, Any]] = {}
         for param in desc.iter_parameters():
             tname = param.type
-            t = self.get_type_descriptor(tname)
+            t = types[param.name]
             mode = param.mode
             if "INCONV" in t or "OUTCONV" in t:
                 p = param.name
@@ -142,24 +185,24 @@ class ShellCodeGenerator(SingleBlockCodeGenerator):
                         self.log.warning(f"No INCONV for type {tname!r}, mode IN")
                     if "OUTCONV" not in t or "OUT" not in t["OUTCONV"]:
                         self.log.warning(f"No OUTCONV for type {tname!r}, mode OUT")
-            if mode is ParamMode.IN and ("INCONV" not in t or mode not in t["INCONV"]):
-                self.log.warning(f"No INCONV for type {tname!r}, mode {mode}")
+            if mode is ParamMode.IN and ("INCONV" not in t or "IN" not in t["INCONV"]):
+                self.log.warning(f"No INCONV for type {tname!r}, mode IN")
             if mode is ParamMode.OUT and (
-                "OUTCONV" not in t or mode not in t["OUTCONV"]
+                "OUTCONV" not in t or "OUT" not in t["OUTCONV"]
             ):
-                self.log.warning(f"No OUTCONV for type {tname!r}, mode {mode}")
+                self.log.warning(f"No OUTCONV for type {tname!r}, mode OUT")
 
         res: Dict[str, Any] = {"nargs": len(args)}
         params = desc.parameters
         res["func"] = name
         res["args"] = self.chunk_args(name, args)
-        res["decl"] = self.chunk_decl(name, params)
-        res["inconv"] = self.chunk_inconv(name, params, args)
-        res["call"] = self.chunk_call(name, params)
-        res["outconv"] = self.chunk_outconv(name, params)
+        res["decl"] = self.chunk_decl(name, params, types)
+        res["inconv"] = self.chunk_inconv(name, params, args, types)
+        res["call"] = self.chunk_call(name, params, types)
+        res["outconv"] = self.chunk_outconv(name, params, types)
         res["default"] = self.chunk_default(name, params, args)
         res["usage"] = self.chunk_usage(name, args)
-        out.write(FUNCTION_TEMPLATE % res)
+        out.write(FUNCTION_TEMPLATE.format_map(res))
 
     def chunk_args(self, func_name: str, params: Dict[str, Dict[str, str]]) -> str:
         res = [
@@ -169,12 +212,16 @@ class ShellCodeGenerator(SingleBlockCodeGenerator):
         res = ["{ " + ", ".join(e) + " }," for e in res]
         return "\n                                   ".join(res)
 
-    def chunk_decl(self, name: str, params: Dict[str, ParamSpec]) -> str:
+    def chunk_decl(
+        self,
+        name: str,
+        params: Dict[str, ParamSpec],
+        types: Dict[str, TypeDescriptor],
+    ) -> str:
         spec = self.get_function_descriptor(name)
 
-        def do_par(pname):
-            param = params[name]
-            type_desc = self.get_type_descriptor(params[pname].type)
+        def do_par(pname: str, param: ParamSpec) -> str:
+            type_desc = types[pname]
             decl = type_desc.declare_c_variable(pname, mode=ParamMode.IN)
 
             default = param.get_default_value(type_desc) or ""
@@ -187,7 +234,7 @@ class ShellCodeGenerator(SingleBlockCodeGenerator):
             else:
                 return ""
 
-        decl = [do_par(n) for n in params]
+        decl = [do_par(n, p) for n, p in params.items()]
         inout = [
             "char* shell_arg_" + n + "=0;" for n, p in params.items() if p.is_output
         ]
@@ -204,27 +251,26 @@ class ShellCodeGenerator(SingleBlockCodeGenerator):
     def chunk_default(
         self, name: str, params: Dict[str, ParamSpec], args: Dict[str, Dict[str, str]]
     ) -> str:
-        def do_par(pname: str) -> str:
-            if params[pname].has_default_value is not None:
+        def do_par(pname: str, param: ParamSpec) -> str:
+            if param.has_default_value and pname in args:
                 shell_no = args[pname]["shell_no"]
                 res = f"  shell_seen[{shell_no}] = 2;"
             else:
                 res = ""
             return res
 
-        res = [do_par(n) for n in params]
-        res = [n for n in res if n != ""]
-        return "\n".join(res)
+        return "\n".join(res for res in starmap(do_par, params.items()) if res)
 
     def chunk_inconv(
         self,
         func_name: str,
         params: Dict[str, ParamSpec],
         args: Dict[str, Dict[str, str]],
+        types: Dict[str, TypeDescriptor],
     ) -> str:
-        def do_par(pname):
-            t = self.get_type_descriptor(params[pname].type)
-            mode = params[pname].mode_str
+        def do_par(pname: str, arg: Dict[str, str]) -> str:
+            t = types[arg["name"]]
+            mode = arg["mode"]
             if "INCONV" in t and mode in t["INCONV"]:
                 inconv = "" + t["INCONV"][mode]
             else:
@@ -233,45 +279,48 @@ class ShellCodeGenerator(SingleBlockCodeGenerator):
                 pname = pname[0:-4]
             return inconv.replace("%C%", pname)
 
-        inconv = [
-            "    case "
-            + str(arg["shell_no"])
-            + ": /* "
-            + name
-            + " */\n      "
-            + do_par(name)
-            for name, arg in args.items()
-        ]
-        inconv = [n + "\n      break;" for n in inconv]
-        inconv = ["".join(n) for n in inconv]
-        text = (
-            "\n    switch (shell_index) {\n"
-            + "\n".join(inconv)
-            + "\n    case "
-            + str(len(inconv))
-            + ":\n      shell_"
-            + func_name
-            + "_usage(argv);\n      break;"
-            + "\n    default:\n      break;\n    }\n"
+        parts = ["\n    switch (shell_index) {\n"]
+        for name, arg in args.items():
+            parts.append(
+                f"    case {arg['shell_no']}: /* {name} */\n"
+                f"      {do_par(name, arg)}\n"
+                "      break;\n"
+            )
+        parts.append(
+            f"    case {len(args)}:\n"
+            f"      shell_{func_name}_usage(argv);\n"
+            "      break;\n"
+            "    default:\n"
+            "      break;\n"
+            "    }\n"
         )
-        return text
+        return "".join(parts)
 
-    def chunk_call(self, func_name: str, params: Dict[str, ParamSpec]) -> str:
+    def chunk_call(
+        self,
+        func_name: str,
+        params: Dict[str, ParamSpec],
+        types: Dict[str, TypeDescriptor],
+    ) -> str:
         parts = []
-        for name, spec in params.items():
-            type = self.get_type_descriptor(spec.type)
-            call = type.get("CALL", name).replace("%C%", name)
+        for name in params:
+            call = types[name].get("CALL", name).replace("%C%", name)
             parts.append(call)
 
         call = ", ".join(parts)
         return f"  shell_result = {func_name}({call});"
 
-    def chunk_outconv(self, name: str, params: Dict[str, ParamSpec]) -> str:
+    def chunk_outconv(
+        self,
+        name: str,
+        params: Dict[str, ParamSpec],
+        types: Dict[str, TypeDescriptor],
+    ) -> str:
         spec = self.get_function_descriptor(name)
 
-        def do_par(pname):
-            t = self.get_type_descriptor(params[pname].type)
-            mode = params[pname].mode_str
+        def do_par(pname: str, param: ParamSpec) -> str:
+            t = types[pname]
+            mode = param.mode_str
             if "OUTCONV" in t and mode in t["OUTCONV"]:
                 outconv = indent(t["OUTCONV"][mode])
             else:
@@ -280,14 +329,12 @@ class ShellCodeGenerator(SingleBlockCodeGenerator):
                 pname = pname[0:-4]
             return outconv.replace("%C%", pname)
 
-        outconv = [do_par(n) for n in params]
+        outconv = [o for o in starmap(do_par, params.items()) if o]
         rt = self.get_type_descriptor(spec.return_type)
         if "OUTCONV" in rt and "OUT" in rt["OUTCONV"]:
             rtout = indent(rt["OUTCONV"]["OUT"])
-        else:
-            rtout = ""
-        outconv.append(rtout.replace("%C%", "shell_result"))
-        outconv = [o for o in outconv if o != ""]
+            if rtout:
+                outconv.append(rtout.replace("%C%", "shell_result"))
         return "\n".join(outconv)
 
     def chunk_usage(self, func_name: str, params: Dict[str, ParamSpec]) -> str:
@@ -1,11 +1,25 @@
 """Helper utility functions for code generators."""
 
+import re
+
 from functools import lru_cache
 from textwrap import indent
-from typing import Callable
+from typing import Callable, Dict
+
+from stimulus.model import ParamSpec
+
+
+__all__ = (
+    "create_indentation_function",
+    "get_dependency_placeholders",
+    "remove_prefix",
+    "replace_placeholders",
+)
 
 
-__all__ = ("create_indentation_function", "remove_prefix")
+#: Regular expression matching placeholder tokens like %I%, %C% or %I1% in
+#: type templates
+_PLACEHOLDER_REGEXP = re.compile("%([A-Z][0-9]*)%")
 
 
 @lru_cache(maxsize=32)
@@ -20,6 +34,19 @@ def create_indentation_function(indentation: str) -> Callable[[str], str]:
     return func
 
 
+def get_dependency_placeholders(
+    param: ParamSpec, token: str, prefix: str = ""
+) -> Dict[str, str]:
+    """Returns a dictionary mapping the numbered placeholders of the given
+    parameter (e.g., ``I1``, ``I2`` and so on for token ``I``) to the names of
+    the corresponding dependencies, prefixed with the given prefix.
+    """
+    return {
+        f"{token}{index}": prefix + dep
+        for index, dep in enumerate(param.dependencies, 1)
+    }
+
+
 def remove_prefix(input: str, prefix: str) -> str:
     """Removes th given prefix from the input string if it is present.
 
@@ -32,3 +59,24 @@ def remove_prefix(input: str, prefix: str) -> str:
         or the input string intact otherwise
     """
     return input[len(prefix) :] if input.startswith(prefix) else input
+
+
+def replace_placeholders(template: str, replacements: Dict[str, str]) -> str:
+    """Replaces placeholder tokens like ``%I%``, ``%C%`` or ``%I1%`` in the
+    given template in a single pass.
+
+    Parameters:
+        template: the template to process
+        replacements: dictionary mapping token names without the enclosing
+            percent signs (e.g., ``I`` or ``C1``) to their replacements.
+            Tokens that do not appear in the dictionary are left intact.
+
+    Returns:
+        the template with the placeholders replaced
+    """
+    if "%" not in template:
+        return template
+
+    return _PLACEHOLDER_REGEXP.sub(
+        lambda match: replacements.get(match.group(1), match.group(0)), template
+    )
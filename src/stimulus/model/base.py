@@ -1,17 +1,26 @@
 """Base classes for model objects."""
 
+import sys
+
 from typing import Any, Dict, Iterable, Optional
 
 __all__ = ("DescriptorMixin",)
 
 
+#: Keyword arguments to pass to ``@dataclass`` for model classes that are
+#: instantiated in large numbers. Slotted dataclasses are supported from
+#: Python 3.10 onwards only; on older versions we fall back to regular ones.
+DATACLASS_KWDS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
 class DescriptorMixin:
     """Mixin class for function and type descriptors."""
 
+    __slots__ = ()
+
     _obj: Dict[str, Any]
 
-    def _parse_as_boolean(self, key: str) -> Optional[bool]:
-        value = self._obj.pop(key, None)
+    def _parse_as_boolean(self, key: str, value: Any) -> Optional[bool]:
         if value is None:
             return None
         elif isinstance(value, (int, float)):
@@ -21,8 +30,7 @@ class DescriptorMixin:
         else:
             return bool(value)
 
-    def _parse_as_comma_separated_list(self, key: str) -> Iterable[str]:
-        value = self._obj.pop(key, None)
+    def _parse_as_comma_separated_list(self, key: str, value: Any) -> Iterable[str]:
         if value is None:
             return ()
         if isinstance(value, str):
@@ -1,3 +1,6 @@
+import re
+import sys
+
 from dataclasses import dataclass, field
 from deepmerge import always_merger
 from typing import (
@@ -7,20 +10,31 @@ from typing import (
     List,
     Mapping,
     Optional,
-    OrderedDict,
     Set,
     Tuple,
 )
 
 from stimulus.utils import camelcase
 
-from .base import DescriptorMixin
+from .base import DATACLASS_KWDS, DescriptorMixin
 from .parameters import ParamSpec
 
 __all__ = ("FunctionDescriptor",)
 
+#: Keys of a function specification that are turned into attributes of the
+#: function descriptor instead of being stored in the key-value store
+_ATTRIBUTE_KEYS = frozenset(("FLAGS", "IGNORE", "INTERNAL", "RETURN"))
+
+#: Keys of a function specification that affect the parsed parameter list
+_PARAMETER_KEYS = frozenset(("DEFAULT", "DEPS", "PARAM_NAMES", "PARAM_ORDER", "PARAMS"))
+
+#: Regular expression matching a single item in the DEPS list of a function
+_DEPENDENCY_SPEC_REGEXP = re.compile(
+    r"\s*(?P<name>\S+)\s+ON\s+(?P<values>.*?)\s*", re.DOTALL
+)
+
 
-@dataclass
+@dataclass(**DATACLASS_KWDS)
 class FunctionDescriptor(Mapping[str, Any], DescriptorMixin):
     """Dataclass that describes a single function for which we can generate
     related code in a code generator.
@@ -32,7 +46,7 @@ class FunctionDescriptor(Mapping[str, Any], DescriptorMixin):
     _obj: Dict[str, Any] = field(default_factory=dict)
     """The specification from which the function descriptor was created."""
 
-    _parameters: Optional[OrderedDict[str, ParamSpec]] = None
+    _parameters: Optional[Dict[str, ParamSpec]] = None
     """Ordered mapping from parameter names to the corresponding specifications,
     or ``None`` if the parameters have not been parsed yet.
     """
@@ -49,6 +63,9 @@ class FunctionDescriptor(Mapping[str, Any], DescriptorMixin):
     return_type: str = "ERROR"
     """The name of the return type of this function."""
 
+    def __contains__(self, key: object) -> bool:
+        return key in self._obj
+
     def __getitem__(self, key: str) -> Any:
         return self._obj[key]
 
@@ -58,6 +75,11 @@ class FunctionDescriptor(Mapping[str, Any], DescriptorMixin):
     def __len__(self):
         return len(self._obj)
 
+    def get(self, key: str, default: Any = None) -> Any:
+        # Overridden for sake of efficiency; Mapping.get() would go through
+        # __getitem__() and catch a KeyError for missing keys
+        return self._obj.get(key, default)
+
     @property
     def is_deprecated(self) -> bool:
         """Returns whether the function is deprecated."""
@@ -71,7 +93,7 @@ class FunctionDescriptor(Mapping[str, Any], DescriptorMixin):
         return self.has_flag("internal")
 
     @property
-    def parameters(self) -> OrderedDict[str, ParamSpec]:
+    def parameters(self) -> Dict[str, ParamSpec]:
         if self._parameters is None:
             self._parameters = self._parse_parameter_specifications()
             self._update_parameter_order()
@@ -207,61 +229,76 @@ class FunctionDescriptor(Mapping[str, Any], DescriptorMixin):
 
           - Any other key in `obj` is merged with the existing key-value store.
         """
-        if "PARAMS" in obj:
-            self._obj["PARAMS"] = ""
-            self._parameters = None
-
-        if "DEPS" in obj:
-            self._obj["DEPS"] = ""
-            self._parameters = None
+        # Keys that are stored as attributes of the descriptor are processed
+        # directly; everything else is merged into the key-value store
+        rest: Dict[str, Any] = {}
+        for key, value in obj.items():
+            if key in _ATTRIBUTE_KEYS:
+                continue
 
-        if "PARAM_NAMES" in obj:
-            self._parameters = None
+            if key in _PARAMETER_KEYS:
+                self._parameters = None
+                if key == "PARAMS" or key == "DEPS":
+                    self._obj[key] = ""
+                elif key == "PARAM_ORDER":
+                    self._param_order.clear()
 
-        if "DEFAULT" in obj:
-            self._parameters = None
+            rest[key] = value
 
-        if "PARAM_ORDER" in obj:
-            self._param_order.clear()
-            self._parameters = None
+        always_merger.merge(self._obj, rest)
 
-        always_merger.merge(self._obj, obj)
+        it = self._parse_as_comma_separated_list("IGNORE", obj.get("IGNORE"))
+        self.ignored_by.update(map(sys.intern, it))
 
-        it = self._parse_as_comma_separated_list("IGNORE")
-        self.ignored_by |= set(it)
-
-        it = self._parse_as_comma_separated_list("FLAGS")
+        it = self._parse_as_comma_separated_list("FLAGS", obj.get("FLAGS"))
         self.flags |= {flag.lower() for flag in it}
 
-        is_internal = self._parse_as_boolean("INTERNAL")
+        is_internal = self._parse_as_boolean("INTERNAL", obj.get("INTERNAL"))
         if is_internal is not None:
             if is_internal is True:
                 self.flags.add("internal")
             else:
                 self.flags.discard("internal")
 
-        return_type: str = self._obj.pop("RETURN", "")
+        return_type: str = obj.get("RETURN", "")
         if return_type:
-            self.return_type = str(return_type)
+            self.return_type = sys.intern(return_type)
 
     def _parse_dependencies(self) -> Dict[str, Tuple[str, ...]]:
         dep_spec_str = self._obj.get("DEPS")
-        deps = dep_spec_str.split(",") if dep_spec_str else []
+        if not dep_spec_str:
+            return {}
 
-        deps = [item.strip().split("ON", 1) for item in deps]
-        deps = [[dd.strip() for dd in item] for item in deps]
-        deps = [[item[0]] + item[1].split(" ", 1) for item in deps]
-        deps = [[dd.strip() for dd in item] for item in deps]
+        result = {}
+        for item in dep_spec_str.split(","):
+            match = _DEPENDENCY_SPEC_REGEXP.fullmatch(item)
+            if match is None:
+                raise RuntimeError(
+                    f"invalid dependency specification {item.strip()!r} in "
+                    f"function {self.name!r}"
+                )
+            name, values = match.group("name", "values")
+            result[name] = tuple(values.split(None, 1))
 
-        return {str(name): tuple(values) for name, *values in deps}
+        return result
 
-    def _parse_parameter_specifications(self) -> OrderedDict[str, ParamSpec]:
+    def _parse_parameter_specifications(self) -> Dict[str, ParamSpec]:
         params: List[str]
 
         param_spec_str = self._obj.get("PARAMS")
         param_name_mapping = self._obj.get("PARAM_NAMES")
         default_value_overrides = self._obj.get("DEFAULT")
 
+        # Fast path for functions without parameters; there is nothing to
+        # parse, and nothing that could refer to unknown parameters either
+        if not (
+            param_spec_str
+            or param_name_mapping
+            or default_value_overrides
+            or self._obj.get("DEPS")
+        ):
+            return {}
+
         # First, get the parameter specifications
         if not param_spec_str:
             params = []
@@ -273,7 +310,6 @@ class FunctionDescriptor(Mapping[str, Any], DescriptorMixin):
             raise TypeError(
                 f"PARAMS must be a string or a list, got {type(param_spec_str)!r}"
             )
-        params = [item.strip() for item in params]
 
         # Figure out which of the parameters are keyword-only. There are three
         # ways to achieve this, in order of precedence:
@@ -287,15 +323,17 @@ class FunctionDescriptor(Mapping[str, Any], DescriptorMixin):
         #   be the name of the first keyword argument. This is compatible with
         #   Stimulus <0.21 as earlier versions will simply ignore this key.
 
-        try:
-            kwarg_marker_index = params.index("*")
-            del params[kwarg_marker_index : (kwarg_marker_index + 1)]
-        except ValueError:
-            kwarg_marker_index = len(params)
-
-        specs = [ParamSpec.from_string(item) for item in params]
-        for spec in specs[kwarg_marker_index:]:
-            spec.is_keyword_only = True
+        specs: List[ParamSpec] = []
+        kwarg_marker_index: Optional[int] = None
+        for item in params:
+            item = item.strip()
+            if item == "*" and kwarg_marker_index is None:
+                kwarg_marker_index = len(specs)
+            else:
+                spec = ParamSpec.from_string(item)
+                if kwarg_marker_index is not None:
+                    spec.is_keyword_only = True
+                specs.append(spec)
 
         first_kwarg_name = self._obj.get("FIRST_KW_PARAM")
         if first_kwarg_name and not any(spec.is_keyword_only for spec in specs):
@@ -305,8 +343,9 @@ class FunctionDescriptor(Mapping[str, Any], DescriptorMixin):
                     is_kwarg = True
                 spec.is_keyword_only = is_kwarg
 
-        # Now that we have the specifications, create an ordered dict
-        result = OrderedDict((spec.name, spec) for spec in specs)
+        # Now that we have the specifications, create a dict; dicts preserve
+        # insertion order so the order of parameters is kept
+        result = {spec.name: spec for spec in specs}
 
         # Parse dependencies between parameters
         for name, deps in self._parse_dependencies().items():
@@ -366,18 +405,17 @@ class FunctionDescriptor(Mapping[str, Any], DescriptorMixin):
         rest_index = -1
         kwarg_index = -1
 
-        not_seen_params = list(self._parameters.keys())
-        valid_params = not_seen_params[:]
+        not_seen_params = dict.fromkeys(self._parameters)
         for name in param_order:
             name = name.strip()
             if name in not_seen_params:
                 self._param_order.append(name)
-                not_seen_params.remove(name)
+                del not_seen_params[name]
             elif name == "...":
                 rest_index = len(self._param_order)
             elif name == "*":
                 kwarg_index = len(self._param_order)
-            elif name not in valid_params:
+            elif name not in self._parameters:
                 raise RuntimeError(
                     f"{name!r} in PARAM_ORDER refers to an unknown parameter in "
                     f"function {self.name!r}"
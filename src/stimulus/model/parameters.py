@@ -1,14 +1,29 @@
 from __future__ import annotations
 
+import re
+import sys
+
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
 
+from stimulus.errors import ParseError
+
+from .base import DATACLASS_KWDS
+
 if TYPE_CHECKING:
     from .types import TypeDescriptor
 
 __all__ = ("ParamMode", "ParamSpec")
 
+#: Regular expression matching the string representation of a parameter
+#: specification after the flags have been stripped from it
+_PARAM_SPEC_REGEXP = re.compile(
+    r"(?:(?P<mode>IN|OUT|INOUT)\s+)?(?!(?:IN|OUT|INOUT)\s)"
+    r"(?P<type>\S+)\s+(?P<name>[^\s=]+)\s*(?:=\s*(?P<default>.*))?",
+    re.DOTALL,
+)
+
 
 class ParamMode(Enum):
     """Enum representing the modes of function parameters."""
@@ -26,6 +41,18 @@ class ParamMode(Enum):
         return self is self.__class__.OUT or self is self.__class__.INOUT
 
 
+#: Mapping from the mode strings used in specification files to the
+#: corresponding parameter modes
+_MODE_BY_STR: Dict[str, ParamMode] = {
+    "IN": ParamMode.IN,
+    "OUT": ParamMode.OUT,
+    "INOUT": ParamMode.INOUT,
+}
+
+#: Mapping from parameter modes to the mode strings used in specification files
+_MODE_STR: Dict[ParamMode, str] = {mode: name for name, mode in _MODE_BY_STR.items()}
+
+
 class DefaultValueType(Enum):
     """Enum representing the different types of default values for function
     parameters.
@@ -40,7 +67,7 @@ class DefaultValueType(Enum):
     EXPLICIT = "explicit"
 
 
-@dataclass
+@dataclass(**DATACLASS_KWDS)
 class ParamSpec:
     """Specification of a single function parameter."""
 
@@ -104,6 +131,23 @@ class ParamSpec:
     `None` means that the name is the same as the "real" name of the parameter.
     """
 
+    mode_str: str = field(init=False, repr=False, compare=False)
+    """Mode of the parameter as a string, in the form used in specification
+    files (``IN``, ``OUT`` or ``INOUT``).
+    """
+
+    is_input: bool = field(init=False, repr=False, compare=False)
+    """Whether the function parameter is an input argument."""
+
+    is_output: bool = field(init=False, repr=False, compare=False)
+    """Whether the function parameter is an output argument."""
+
+    def __post_init__(self) -> None:
+        mode = self.mode
+        self.mode_str = _MODE_STR[mode]
+        self.is_input = mode is ParamMode.IN or mode is ParamMode.INOUT
+        self.is_output = mode is ParamMode.OUT or mode is ParamMode.INOUT
+
     @classmethod
     def from_string(cls, value: str):
         """Constructs a ParamSpec object from its string representation in a
@@ -123,21 +167,21 @@ class ParamSpec:
                 # No flag was stripped in this iteration, break out of the loop
                 break
 
-        parts = value.split(" ", 1)
-        if parts[0] not in ("OUT", "IN", "INOUT"):
-            parts = ["IN", parts[0]] + parts[1].split(" ", 1)
-        else:
-            parts = [parts[0]] + parts[1].split(" ", 1)
-        if "=" in parts[2]:
-            parts = parts[:2] + parts[2].split("=", 1)
+        match = _PARAM_SPEC_REGEXP.fullmatch(value)
+        if match is None:
+            raise ParseError(f"Invalid parameter specification: {value!r}")
 
-        mode, type, name, *rest = [part.strip() for part in parts]
+        mode, type_, name, default = match.group("mode", "type", "name", "default")
 
         return ParamSpec(
-            name=str(name),
-            mode=ParamMode(mode.lower()),
-            type=str(type),
-            default=(DefaultValueType.ABSTRACT, rest[0]) if rest else None,
+            name=sys.intern(name),
+            mode=_MODE_BY_STR[mode] if mode else ParamMode.IN,
+            type=sys.intern(type_),
+            default=(
+                (DefaultValueType.ABSTRACT, default.strip())
+                if default is not None
+                else None
+            ),
             is_primary="PRIMARY" in flags_present,
             is_optional="OPTIONAL" in flags_present,
             is_keyword_only="KW" in flags_present,
@@ -192,20 +236,6 @@ class ParamSpec:
         """Returns whether the function parameter is marked as deprecated."""
         return self.type == "DEPRECATED"
 
-    @property
-    def is_input(self) -> bool:
-        """Returns whether the function parameter is an input argument."""
-        return self.mode in (ParamMode.IN, ParamMode.INOUT)
-
-    @property
-    def is_output(self) -> bool:
-        """Returns whether the function parameter is an output argument."""
-        return self.mode in (ParamMode.OUT, ParamMode.INOUT)
-
-    @property
-    def mode_str(self) -> str:
-        return str(self.mode.value).upper()
-
     @property
     def name_in_higher_level_interface(self) -> str:
         """Returns the name of the parameter when it is used in the higher-level
@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from deepmerge import always_merger
-from typing import Any, Dict, Mapping, Optional, Set
+from typing import Any, Dict, Mapping, Optional, Set, Tuple
 
 from stimulus.errors import NoSuchTypeError
 
@@ -25,6 +25,21 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
 
     _obj: Dict[str, str] = field(default_factory=dict)
 
+    _c_type_cache: Dict[ParamMode, Optional[str]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    """Cache of the C types of this type in the different parameter modes"""
+
+    _conversion_template_cache: Dict[Tuple[str, ParamMode], Optional[str]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    """Cache of the input and output conversion templates of this type in the
+    different parameter modes; `None` means that there is no template
+    """
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._obj
+
     def __getitem__(self, key: str) -> Any:
         return self._obj[key]
 
@@ -34,6 +49,11 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
     def __len__(self):
         return len(self._obj)
 
+    def get(self, key: str, default: Any = None) -> Any:
+        # Overridden for sake of efficiency; Mapping.get() would go through
+        # __getitem__() and catch a KeyError for missing keys
+        return self._obj.get(key, default)
+
     def declare_c_function_argument(
         self, name: Optional[str] = None, *, mode: ParamMode = ParamMode.OUT
     ) -> str:
@@ -95,7 +115,7 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
         Returns:
             a C variable declaration, without indentation or trailing newline
         """
-        mode_str = str(mode.value).upper()
+        mode_str = mode.name
         c_decl = self._obj.get("CDECL")
         if isinstance(c_decl, dict):
             c_decl = c_decl.get(mode_str)
@@ -125,7 +145,17 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
                 not state explicitly that the abstract type does _not_ have
                 a corresponding C type either)
         """
-        mode_str = str(mode.value).upper()
+        result = self._c_type_cache.get(mode, _MISSING)
+        if result is _MISSING:
+            result = self._c_type_cache[mode] = self._get_c_type_uncached(mode)
+        return result  # type: ignore
+
+    def _get_c_type_uncached(self, mode: ParamMode) -> Optional[str]:
+        """Determines the C type corresponding to this abstract type in the
+        given mode, without consulting the cache. See `get_c_type()` for more
+        details.
+        """
+        mode_str = mode.name
         c_type = self._obj.get("CTYPE", _MISSING)
         if c_type is _MISSING:
             raise NoSuchTypeError(
@@ -163,26 +193,8 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
         `INOUT` mode, it is assumed to be identical to the code snippet for
         the `IN` mode.
         """
-        if "INCONV" in self:
-            inconv = self["INCONV"]
-            if isinstance(inconv, str):
-                return inconv if mode.is_input else default
-            elif isinstance(inconv, dict):
-                try:
-                    return inconv[mode.value.upper()] or default
-                except KeyError:
-                    if mode is ParamMode.INOUT:
-                        return self.get_input_conversion_template_for(
-                            ParamMode.IN, default=default
-                        )
-                    else:
-                        return default
-            else:
-                raise TypeError(
-                    f"INCONV should be a string or a dict for type {self.name}"
-                )
-        else:
-            return default
+        result = self._get_conversion_template("INCONV", mode)
+        return default if result is None else result
 
     def get_output_conversion_template_for(
         self, mode: ParamMode, *, default: str = ""
@@ -195,26 +207,46 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
         `INOUT` mode, it is assumed to be identical to the code snippet for
         the `OUT` mode.
         """
-        if "OUTCONV" in self:
-            outconv = self["OUTCONV"]
-            if isinstance(outconv, str):
-                return outconv if mode.is_output else default
-            elif isinstance(outconv, dict):
-                try:
-                    return outconv[mode.value.upper()] or default
-                except KeyError:
-                    if mode is ParamMode.INOUT:
-                        return self.get_output_conversion_template_for(
-                            ParamMode.OUT, default=default
-                        )
-                    else:
-                        return default
-            else:
-                raise TypeError(
-                    f"OUTCONV should be a string or a dict for type {self.name}"
+        result = self._get_conversion_template("OUTCONV", mode)
+        return default if result is None else result
+
+    def _get_conversion_template(self, key: str, mode: ParamMode) -> Optional[str]:
+        """Returns the conversion template stored under the given key for the
+        given mode, or `None` if there is no such template. Results are cached
+        until the type descriptor is updated.
+
+        Parameters:
+            key: ``INCONV`` or ``OUTCONV``
+            mode: the mode of the parameter being converted
+        """
+        cache_key = key, mode
+        try:
+            return self._conversion_template_cache[cache_key]
+        except KeyError:
+            pass
+
+        is_input = key == "INCONV"
+        conv = self._obj.get(key, _MISSING)
+        if conv is _MISSING:
+            result = None
+        elif isinstance(conv, str):
+            is_applicable = mode.is_input if is_input else mode.is_output
+            result = conv if is_applicable else None
+        elif isinstance(conv, dict):
+            mode_str = mode.name
+            if mode_str in conv:
+                result = conv[mode_str] or None
+            elif mode is ParamMode.INOUT:
+                result = self._get_conversion_template(
+                    key, ParamMode.IN if is_input else ParamMode.OUT
                 )
+            else:
+                result = None
         else:
-            return default
+            raise TypeError(f"{key} should be a string or a dict for type {self.name}")
+
+        self._conversion_template_cache[cache_key] = result
+        return result
 
     def has_flag(self, flag: str) -> bool:
         """Checks whether the type descriptor has the given flag, in a
@@ -261,7 +293,11 @@ class TypeDescriptor(Mapping[str, Any], DescriptorMixin):
 
           - Any other key in `obj` is merged with the existing key-value store.
         """
-        always_merger.merge(self._obj, obj)
+        always_merger.merge(
+            self._obj, {key: value for key, value in obj.items() if key != "FLAGS"}
+        )
+        self._c_type_cache.clear()
+        self._conversion_template_cache.clear()
 
-        it = self._parse_as_comma_separated_list("FLAGS")
+        it = self._parse_as_comma_separated_list("FLAGS", obj.get("FLAGS"))
         self.flags |= {flag.lower() for flag in it}
@@ -0,0 +1,53 @@
+"""Functions for parsing specification files."""
+
+from collections import Counter
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, IO
+
+__all__ = ("parse_specification_file",)
+
+
+@lru_cache(maxsize=None)
+def _get_yaml_loader() -> Callable[[IO[str]], Any]:
+    """Returns the function that loads a YAML document from a stream.
+
+    The YAML module is imported lazily, on the first call to this function;
+    the result is cached and reused for all the specification files. The
+    LibYAML-based loader is used if PyYAML was built with it.
+    """
+    from yaml import load
+
+    try:
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader  # type: ignore
+
+    return partial(load, Loader=SafeLoader)
+
+
+def parse_specification_file(filename: str) -> Dict[str, Any]:
+    """Parses a function or type specification file in YAML format.
+
+    Parameters:
+        filename: the name of the file to parse
+
+    Returns:
+        the parsed contents of the specification file
+
+    Raises:
+        ValueError: if the file contains duplicate top-level keys
+    """
+    load = _get_yaml_loader()
+
+    with open(filename) as fp:
+        # Check for top-level duplicate keys
+        keys = Counter(
+            line.strip().rstrip(":") for line in fp if line and line[0].isalpha()
+        )
+        duplicates = sorted(k for k, v in keys.items() if v > 1)
+        if duplicates:
+            raise ValueError(f"duplicate keys found: {', '.join(duplicates)}")
+
+        # No top-level duplicate keys, rewind and load the YAML file
+        fp.seek(0)
+        return load(fp)
@@ -1,8 +1,10 @@
+from functools import lru_cache
 from typing import Callable, TypeVar
 
 __all__ = ("camelcase", "constant")
 
 
+@lru_cache(maxsize=None)
 def camelcase(s: str) -> str:
     """Returns a camelCase version of the given string (as used in Java
     libraries.